@@ -55,6 +55,8 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "4320
 ADMIN_NAME = os.getenv("ADMIN_NAME")
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
+# Re-hash the stored admin password from ADMIN_PASSWORD on every migration run
+FORCE_ADMIN_PASSWORD_RESET = os.getenv("FORCE_ADMIN_PASSWORD_RESET", "0").lower() in ("1", "true", "yes")
 UPLOADS_DIR = os.getenv("UPLOADS_DIR", "/app/uploads")
 # Shared volume and stage configuration
 STAGE = os.getenv("STAGE", "development")
@@ -91,9 +93,33 @@ EXTRACTOR_RETRY_CONFIG = {
     "Unstructured": {"max_retries": 2, "countdown": 10},
 }
 
+# Extractors that do their work in-process (CPU-bound) run on a separate
+# prefork worker queue; API-backed extractors stay on the default queue,
+# served by the gevent pool
+CPU_EXTRACTION_QUEUE = "cpu"
+CPU_BOUND_EXTRACTORS = frozenset({
+    "PyPDF2",
+    "PyMuPDF",
+    "PDFPlumber",
+    "Tesseract",
+    "Camelot",
+    "Tabula",
+    "MarkItDown",
+    "Unstructured",
+})
+
 # Default for unknown extractors
 DEFAULT_RETRY_CONFIG = {"max_retries": 2, "countdown": 10}
 
 # Circuit breaker settings
 CIRCUIT_BREAKER_THRESHOLD = 5  # consecutive failures before breaking
-CIRCUIT_BREAKER_TIMEOUT = 300  # seconds before resetting circuit
\ No newline at end of file
+CIRCUIT_BREAKER_TIMEOUT = 300  # seconds before resetting circuit
+
+# Async extraction job polling: exponential backoff between status checks,
+# aborting jobs that have not finished within the ceiling
+ASYNC_JOB_POLL_INITIAL_SECONDS = 1
+ASYNC_JOB_POLL_MAX_SECONDS = 10
+ASYNC_JOB_MAX_WAIT_SECONDS = int(os.getenv("ASYNC_JOB_MAX_WAIT_SECONDS", "1800"))
+# Headroom on top of ASYNC_JOB_MAX_WAIT_SECONDS for the broker's visibility
+# timeout: download, extraction and DB writes around the wait
+VISIBILITY_TIMEOUT_MARGIN_SECONDS = 1800
@@ -1,8 +1,22 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+import orjson
 from .constants import ASYNC_DATABASE_URL
 
-engine_async = create_async_engine(ASYNC_DATABASE_URL, echo=False)
+
+def json_serializer(value):
+    """orjson-backed JSON encoder for JSON/JSONB columns"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+json_deserializer = orjson.loads
+
+engine_async = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
+)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine_async,
@@ -123,7 +123,7 @@ class LlamaParseExtractor(PDFExtractorInterface):
             result = response.text
             
             # Parse the result by pages
-            page_contents = self._parse_content_by_pages(result)
+            page_contents = self._parse_content_by_pages(result, job_id)
             
             # Store result for internal use
             self._last_result = page_contents
@@ -134,7 +134,7 @@ class LlamaParseExtractor(PDFExtractorInterface):
             logger.error(f"Error fetching LlamaParse result: {str(e)}")
             return {}
 
-    def _parse_content_by_pages(self, content: str) -> dict:
+    def _parse_content_by_pages(self, content: str, job_id: str) -> dict:
         """
         Parse LlamaParse content and separate it by pages.
         """
@@ -165,7 +165,7 @@ class LlamaParseExtractor(PDFExtractorInterface):
                             "extractor": "LlamaParse",
                             "format": "markdown",
                             "page_number": page_num,
-                            "job_id": self._job_id
+                            "job_id": job_id
                         }
                     }
             else:
@@ -183,7 +183,7 @@ class LlamaParseExtractor(PDFExtractorInterface):
                                 "extractor": "LlamaParse",
                                 "format": "markdown",
                                 "page_number": i,
-                                "job_id": self._job_id
+                                "job_id": job_id
                             }
                         }
             
@@ -198,7 +198,7 @@ class LlamaParseExtractor(PDFExtractorInterface):
                         "extractor": "LlamaParse",
                         "format": "markdown",
                         "page_number": 1,
-                        "job_id": self._job_id
+                        "job_id": job_id
                     }
                 }
                 
@@ -214,7 +214,7 @@ class LlamaParseExtractor(PDFExtractorInterface):
                     "extractor": "LlamaParse",
                     "format": "markdown",
                     "page_number": 1,
-                    "job_id": self._job_id,
+                    "job_id": job_id,
                     "error": str(e)
                 }
             }
@@ -1,5 +1,5 @@
 import pdfplumber
-from typing import Dict, Any, Union
+from typing import Dict, Any, Iterator, Tuple, Union
 from src.interface import PDFExtractorInterface
 
 class PDFPlumberExtractor(PDFExtractorInterface):
@@ -19,8 +19,17 @@ class PDFPlumberExtractor(PDFExtractorInterface):
         Extract text and tables from PDF synchronously.
         Stores result internally and returns it directly.
         """
-        page_contents = {}
+        page_contents = dict(self.iter_pages(file_path))
+        self._last_result = page_contents
+        return page_contents
+
+    def supports_page_iteration(self) -> bool:
+        return True
 
+    def iter_pages(self, file_path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield each page's text and tables as it is extracted.
+        """
         with pdfplumber.open(file_path) as pdf:
             for page_num, page in enumerate(pdf.pages, 1):
                 # Extract text (includes table content as text too)
@@ -46,10 +55,7 @@ class PDFPlumberExtractor(PDFExtractorInterface):
                     "TABLE": "\n\n".join(table_strings) if table_strings else ""
                 }
 
-                page_contents[page_num] = {"content": content}
-
-        self._last_result = page_contents
-        return page_contents
+                yield page_num, {"content": content}
 
     def get_status(self, job_id: str) -> str:
         # Always succeeds immediately since pdfplumber is sync
@@ -63,5 +69,8 @@ class PDFPlumberExtractor(PDFExtractorInterface):
         # Local libraries don’t support webhooks
         return False
 
+    def is_slow(self) -> bool:
+        return False
+
     def handle_webhook(self, payload: dict) -> Union[str, dict]:
         raise NotImplementedError("PDFPlumber does not support webhooks")
\ No newline at end of file
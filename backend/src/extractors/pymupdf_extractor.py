@@ -1,5 +1,5 @@
 import fitz  # PyMuPDF
-from typing import Dict, Any, Union
+from typing import Dict, Any, Iterator, Tuple, Union
 from src.interface import PDFExtractorInterface
 
 class PyMuPDFExtractor(PDFExtractorInterface):
@@ -18,23 +18,30 @@ class PyMuPDFExtractor(PDFExtractorInterface):
         """
         Extract text from PDF using PyMuPDF synchronously.
         """
-        page_contents: Dict[int, Dict[str, str]] = {}
-
-        doc = fitz.open(file_path)
+        page_contents: Dict[int, Dict[str, str]] = dict(self.iter_pages(file_path))
+        self._last_result = page_contents
+        return True
 
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            text = page.get_text()
+    def supports_page_iteration(self) -> bool:
+        return True
 
-            page_contents[page_num + 1] = {
-                "content": {
-                    "TEXT": text or ""
+    def iter_pages(self, file_path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield the text of each page as it is extracted.
+        """
+        doc = fitz.open(file_path)
+        try:
+            for page_num in range(doc.page_count):
+                page = doc[page_num]
+                text = page.get_text()
+
+                yield page_num + 1, {
+                    "content": {
+                        "TEXT": text or ""
+                    }
                 }
-            }
-
-        doc.close()
-        self._last_result = page_contents
-        return True
+        finally:
+            doc.close()
 
     def get_status(self, job_id: str) -> str:
         # Always succeeds immediately since PyMuPDF is sync
@@ -47,5 +54,8 @@ class PyMuPDFExtractor(PDFExtractorInterface):
     def supports_webhook(self) -> bool:
         return False
 
+    def is_slow(self) -> bool:
+        return False
+
     def handle_webhook(self, payload: dict) -> Union[str, dict]:
         raise NotImplementedError("PyMuPDF does not support webhooks")
@@ -67,6 +67,12 @@ class PyPDF2Extractor(PDFExtractorInterface):
         """
         return False
 
+    def is_slow(self) -> bool:
+        """
+        PyPDF2 finishes in well under a second per document.
+        """
+        return False
+
     def handle_webhook(self, payload: dict) -> Union[str, dict]:
         """
         Webhook handling not supported for PyPDF2.
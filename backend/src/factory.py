@@ -1,3 +1,4 @@
+import functools
 from src.extractors.pdfplumber_extractor import PDFPlumberExtractor
 from src.extractors.pymupdf_extractor import PyMuPDFExtractor
 # from src.extractors.camelot_extractor import CamelotExtractor
@@ -11,6 +12,7 @@ from src.extractors.openai_vision_extractor import OpenAIVisionExtractor
 # from src.extractors.tabula_extractor import TabulaExtractor
 # from src.extractors.unstructured_extractor import UnstructuredExtractor
 from src.models import PDFExtractorType
+from src.constants import CPU_BOUND_EXTRACTORS
 
 # Map enum values → reader classes
 READER_MAP = {
@@ -40,3 +42,23 @@ def get_reader(extractor_type: str):
         raise ValueError(f"Unknown extractor type: {extractor_type}")
 
     return READER_MAP[extractor_type]()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_shared_reader(extractor_type: str):
+    return get_reader(extractor_type)
+
+
+def get_task_reader(extractor_type: str):
+    """
+    Return the reader for one extraction task.
+
+    Readers keep per-call state on the instance (_last_result, job ids), so
+    one instance is only shared where tasks never overlap inside a process:
+    the CPU-bound extractors, served by the prefork queue, reuse a single
+    reader per worker process. Readers on the gevent pool, where tasks
+    interleave at every network wait, get a fresh instance per task.
+    """
+    if extractor_type in CPU_BOUND_EXTRACTORS:
+        return _get_shared_reader(extractor_type)
+    return get_reader(extractor_type)
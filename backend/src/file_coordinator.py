@@ -91,45 +91,71 @@ def get_shared_file_path(document_uuid: str, filename: str) -> str:
     """
     return os.path.join(SHARED_VOLUME_PATH, f"{document_uuid}_{filename}")
 
-def mark_task_complete(document_uuid: str, job_uuid: str) -> None:
+def _remove_pending_task(document_uuid: str, job_uuid: str, pipe=None) -> list:
     """
-    Mark a task as complete and check if file cleanup is needed.
+    Remove a task from the document's pending set.
     
     Args:
         document_uuid: Document identifier
         job_uuid: Task identifier
+        pipe: Optional pipeline with the caller's commands already queued;
+            they are sent in the same round-trip
+    
+    Returns:
+        The pipeline results: the caller's queued commands first, the number
+        of tasks still pending last
     """
     tasks_key = f"doc_tasks:{document_uuid}"
+    if pipe is None:
+        pipe = redis_client.pipeline()
+    pipe.srem(tasks_key, job_uuid)
+    pipe.scard(tasks_key)
+    return pipe.execute()
+
+def mark_task_complete(document_uuid: str, job_uuid: str, pipe=None) -> list:
+    """
+    Mark a task as complete and check if file cleanup is needed.
     
-    # Remove task from pending set
-    redis_client.srem(tasks_key, job_uuid)
+    Args:
+        document_uuid: Document identifier
+        job_uuid: Task identifier
+        pipe: Optional pipeline to execute along with the bookkeeping
     
-    # Check if all tasks are complete
-    if should_cleanup_file(document_uuid):
+    Returns:
+        The pipeline results, the caller's queued commands first
+    """
+    results = _remove_pending_task(document_uuid, job_uuid, pipe)
+    # Clean up once no tasks remain
+    if results[-1] == 0:
         cleanup_shared_file(document_uuid)
     
     logger.info(f"Marked task {job_uuid} as complete for document {document_uuid}")
+    return results
 
-def mark_task_failed(document_uuid: str, job_uuid: str) -> None:
+def mark_task_failed(document_uuid: str, job_uuid: str, pipe=None) -> list:
     """
     Handle task failure based on STAGE configuration.
     
     Args:
         document_uuid: Document identifier
         job_uuid: Task identifier
+        pipe: Optional pipeline to execute along with the bookkeeping
+    
+    Returns:
+        The pipeline results, the caller's queued commands first
     """
-    tasks_key = f"doc_tasks:{document_uuid}"
+    results = _remove_pending_task(document_uuid, job_uuid, pipe)
+    remaining_tasks = results[-1]
     
     if CLEANUP_ON_TASK_FAILURE:
         # Development mode: treat failure same as completion for cleanup
-        redis_client.srem(tasks_key, job_uuid)
-        if should_cleanup_file(document_uuid):
+        if remaining_tasks == 0:
             cleanup_shared_file(document_uuid)
         logger.info(f"Marked failed task {job_uuid} for cleanup (dev mode)")
     else:
         # Production mode: keep file for retry, just remove from pending
-        redis_client.srem(tasks_key, job_uuid)
         logger.info(f"Marked task {job_uuid} as failed, keeping file for retry (prod mode)")
+    return results
 
 def cleanup_shared_file(document_uuid: str) -> None:
     """
@@ -1,5 +1,5 @@
 
-from typing import Union
+from typing import Iterator, Tuple, Union
 from abc import ABC, abstractmethod
 
 class PDFExtractorInterface(ABC):
@@ -52,4 +52,30 @@ class PDFExtractorInterface(ABC):
         Return standardized parsed output.
         No-op for sync libs.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def is_slow(self) -> bool:
+        """
+        Return False for local libs that finish in well under a second; the
+        worker then skips the intermediate Processing status write for them.
+        """
+        return True
+
+    def supports_page_iteration(self) -> bool:
+        """
+        Return True if `iter_pages` is overridden to stream pages as they are extracted.
+        """
+        return False
+
+    def iter_pages(self, file_path: str) -> Iterator[Tuple[int, dict]]:
+        """
+        Yield (page_number, page) one page at a time, in the same shape as the
+        values `read` returns, so callers can persist pages as they are produced.
+        The default runs `read` and walks the full result, which only works for
+        sync readers (the result is ready once `read` returns); readers that
+        override it return True from `supports_page_iteration`.
+        """
+        result = self.read(file_path)
+        if not isinstance(result, dict):
+            result = self.get_result(result)
+        yield from (result or {}).items()
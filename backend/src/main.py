@@ -1,12 +1,14 @@
-from fastapi import Depends, FastAPI, File, UploadFile, HTTPException, Form
+from fastapi import BackgroundTasks, Depends, FastAPI, File, UploadFile, HTTPException, Form, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from fastapi.openapi.models import OpenAPI
-from sqlalchemy import select, delete, update, or_, func
+from sqlalchemy import select, insert, delete, update, or_, func, exists
 from typing import List, Optional, Dict, Any
 import uuid
 import aioboto3
+import functools
 import json
 import logging
 import PyPDF2
@@ -34,6 +36,8 @@ from .models import (
     ExtractionStatus,
     PDFExtractorType,
     ImageExtractorType,
+    is_pdf_extractor,
+    is_image_extractor,
     ProjectResponse,
     User,
     MultipleUploadResponse,
@@ -44,8 +48,14 @@ from .models import (
     AnnotationResponse,
     UserRatingBreakdown,
     AnnotationListItem,
+    DOCUMENT_LIST_ADAPTER,
+    JOB_LIST_ADAPTER,
+    ANNOTATION_LIST_ADAPTER,
+    ANNOTATION_ITEM_LIST_ADAPTER,
+    RATING_BREAKDOWN_LIST_ADAPTER,
+    UUIDStr,
 )
-from src.tasks import process_document_with_extractor
+from src.tasks import dispatch_extractors, process_document_with_extractor
 from src.auth.routes import router as auth_router
 from src.auth.security import get_current_user
 from src.constants import AWS_BUCKET_NAME, AWS_REGION
@@ -80,13 +90,21 @@ async def start_background_tasks_for_documents(
     selected_extractor_list: List[str]
 ) -> None:
     """
-    Start background extraction tasks for uploaded documents.
+    Create extraction jobs for uploaded documents and start their background tasks.
+
+    All job rows are written with a single multi-row INSERT and committed
+    before any task is queued, so workers never look up an unsaved job.
     
     Args:
         db: Database session
         document_data: List of dictionaries containing document info (uuid, file_type, file_path)
         selected_extractor_list: List of selected extractor names
     """
+    from src.file_coordinator import register_extraction_tasks
+    from src.constants import FILE_CLEANUP_TTL_SECONDS
+
+    job_rows = []
+    jobs_by_document = []
     for doc_info in document_data:
         document_uuid = doc_info["uuid"]
         file_type = doc_info["file_type"]
@@ -97,44 +115,52 @@ async def start_background_tasks_for_documents(
             file_extractors = [
                 extractor.value for extractor in PDFExtractorType
             ]
+            is_valid_extractor = is_pdf_extractor
         else:  # image
             file_extractors = [
                 extractor.value for extractor in ImageExtractorType
             ]
+            is_valid_extractor = is_image_extractor
         
         # Use selected extractors if provided, otherwise use all for file type
         if selected_extractor_list:
             # Filter selected extractors to only include those valid for this file type
-            file_extractors = [ext for ext in selected_extractor_list if ext in file_extractors]
+            file_extractors = [ext for ext in selected_extractor_list if is_valid_extractor(ext)]
         
         # Create extraction jobs for selected extractors
-        extraction_jobs = []
-        for extractor_name in file_extractors:
-            job_uuid = str(uuid.uuid4())
-            extraction_job = DocumentExtractionJob(
-                uuid=job_uuid,
-                document_uuid=document_uuid,
-                extractor=extractor_name,
-                status=ExtractionStatus.NOT_STARTED,
-            )
-            db.add(extraction_job)
-            extraction_jobs.append(extraction_job)
+        extraction_jobs = [
+            {
+                "uuid": str(uuid.uuid4()),
+                "document_uuid": document_uuid,
+                "extractor": extractor_name,
+                "status": ExtractionStatus.NOT_STARTED,
+            }
+            for extractor_name in file_extractors
+        ]
+        job_rows.extend(extraction_jobs)
+        jobs_by_document.append((document_uuid, file_path, extraction_jobs))
+
+    if not job_rows:
+        return
+    # Executemany of a Core insert is sent as batched multi-row INSERTs
+    await db.execute(insert(DocumentExtractionJob), job_rows)
+    await db.commit()
+
+    for document_uuid, file_path, extraction_jobs in jobs_by_document:
         # Register all tasks in Redis before starting
-        from src.file_coordinator import register_extraction_tasks
-        from src.constants import FILE_CLEANUP_TTL_SECONDS
-        
-        job_uuids = [job.uuid for job in extraction_jobs]
         register_extraction_tasks(
             document_uuid, 
-            job_uuids, 
+            [job["uuid"] for job in extraction_jobs], 
             FILE_CLEANUP_TTL_SECONDS
         )
         
-        # Start background tasks for each extractor
-        for job in extraction_jobs:
-            process_document_with_extractor.delay(
-                job.uuid, document_uuid, str(file_path), job.extractor
-            )
+        # Start the document's extractor tasks with one message; the
+        # worker fans them out as a group
+        dispatch_extractors.delay(
+            document_uuid,
+            str(file_path),
+            [(job["uuid"], job["extractor"]) for job in extraction_jobs],
+        )
 
 async def lifespan(app: FastAPI):
     """Application lifespan: startup and shutdown events"""
@@ -235,9 +261,13 @@ async def health_check():
     return {"status": "healthy", "message": "PDF Extraction Tool is running"}
 
 
-@app.get("/extractors", response_model=ExtractorsResponse)
-async def get_extractors():
-    """Get available extractors grouped by category for PDF and Image files"""
+@functools.lru_cache(maxsize=1)
+def _extractors_payload() -> bytes:
+    """Build the extractor catalog once and cache its JSON encoding.
+
+    The catalog only depends on READER_MAP and the extractor enums, which
+    are fixed for the life of the process.
+    """
     from .factory import READER_MAP
     from .models import PDFExtractorType, ImageExtractorType
     
@@ -315,15 +345,22 @@ async def get_extractors():
     pdf_extractors = [cat for cat in pdf_extractors if cat.extractors]
     image_extractors = [cat for cat in image_extractors if cat.extractors]
     
-    return ExtractorsResponse(
+    response = ExtractorsResponse(
         pdf_extractors=pdf_extractors, 
         image_extractors=image_extractors
     )
+    return response.model_dump_json()
+
 
+@app.get("/extractors", response_model=ExtractorsResponse)
+async def get_extractors():
+    """Get available extractors grouped by category for PDF and Image files"""
+    # Serve the cached bytes directly: no per-request model build or encode
+    return Response(content=_extractors_payload(), media_type="application/json")
 
 @app.post("/projects/{project_uuid}/upload-multiple", response_model=MultipleUploadResponse)
 async def upload_multiple_documents(
-    project_uuid: str,
+    project_uuid: UUIDStr,
     files: List[UploadFile] = File(...),
     db: AsyncSession = Depends(get_db, use_cache=True),
     user: User = Depends(get_current_user, use_cache=True),
@@ -452,7 +489,6 @@ async def upload_multiple_documents(
                 file_type=file_type,
                 project_uuid=project_uuid,
                 user_id=user.id,
-                owner_name=user.name,
             )
             db.add(document)
             
@@ -480,7 +516,6 @@ async def upload_multiple_documents(
     # Phase 3: Start background tasks for all successfully uploaded documents
     if document_data:
         await start_background_tasks_for_documents(db, document_data, selected_extractor_list)
-        await db.commit()  # Commit the extraction jobs
     
     return MultipleUploadResponse(
         message=f"Successfully uploaded {len(document_uuids)} files. {len(failed_uploads)} files failed.",
@@ -497,7 +532,6 @@ async def create_project(project: ProjectCreateRequest, db: AsyncSession = Depen
             name=project.name,
             description=project.description,
             user_id=user.id,
-            owner_name=user.name,
             file_upload_type=project.file_upload_type
         )
         db.add(new_project)
@@ -508,7 +542,7 @@ async def create_project(project: ProjectCreateRequest, db: AsyncSession = Depen
             name=new_project.name,
             description=new_project.description,
             created_at=to_utc_isoformat(new_project.created_at),
-            owner_name=new_project.owner_name,
+            owner_name=user.name,
             file_upload_type=new_project.file_upload_type,
             is_owner=True
         )
@@ -522,7 +556,12 @@ async def create_project(project: ProjectCreateRequest, db: AsyncSession = Depen
 @app.get("/projects", response_model=List[ProjectResponse])
 async def list_projects(db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # Show all projects regardless of owner, excluding deleted projects
-    result = await db.execute(select(Project).where(Project.deleted_at.is_(None)).order_by(Project.created_at.desc()))
+    result = await db.execute(
+        select(Project)
+        .where(Project.deleted_at.is_(None))
+        .order_by(Project.created_at.desc())
+        .options(selectinload(Project.owner).load_only(User.id, User.name))
+    )
     projects = result.scalars().all()
     return [
         ProjectResponse(
@@ -539,9 +578,13 @@ async def list_projects(db: AsyncSession = Depends(get_db), user: User = Depends
 
 
 @app.get("/projects/{project_uuid}", response_model=ProjectResponse)
-async def get_project(project_uuid: str, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def get_project(project_uuid: UUIDStr, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # Allow any user to view any project, excluding deleted projects
-    result = await db.execute(select(Project).where(Project.uuid == project_uuid, Project.deleted_at.is_(None)))
+    result = await db.execute(
+        select(Project)
+        .where(Project.uuid == project_uuid, Project.deleted_at.is_(None))
+        .options(selectinload(Project.owner).load_only(User.id, User.name))
+    )
     p = result.scalar_one_or_none()
     if not p:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -556,7 +599,7 @@ async def get_project(project_uuid: str, db: AsyncSession = Depends(get_db), use
     )
 
 @app.delete("/delete-project/{project_uuid}")
-async def delete_project(project_uuid: str, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def delete_project(project_uuid: UUIDStr, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # Soft delete: mark project as deleted instead of removing from database
     try:
         # Only the owner (creator) can delete the project
@@ -580,7 +623,7 @@ async def delete_project(project_uuid: str, db: AsyncSession = Depends(get_db),
 
 @app.get("/projects/{project_uuid}/documents", response_model=PaginatedDocumentsResponse)
 async def list_project_documents(
-    project_uuid: str, 
+    project_uuid: UUIDStr, 
     page: int = 1, 
     page_size: int = 10,
     sort_by: str = "uploaded_at",
@@ -635,20 +678,26 @@ async def list_project_documents(
     total_pages = math.ceil(total_count / page_size) if total_count > 0 else 1
     offset = (page - 1) * page_size
 
-    # Build dynamic sorting
-    sort_column = getattr(Document, sort_by)
+    # Build dynamic sorting; the owner's name lives on users
+    sort_column = User.name if sort_by == "owner_name" else getattr(Document, sort_by)
     if sort_direction == "desc":
         order_clause = sort_column.desc()
     else:
         order_clause = sort_column.asc()
 
     # Get paginated documents
-    result = await db.execute(
+    query = (
         select(Document)
         .where(
             Document.project_uuid == project_uuid,
             Document.deleted_at.is_(None)
         )
+        .options(selectinload(Document.owner).load_only(User.id, User.name))
+    )
+    if sort_by == "owner_name":
+        query = query.outerjoin(Document.owner)
+    result = await db.execute(
+        query
         .order_by(order_clause)
         .offset(offset)
         .limit(page_size)
@@ -678,9 +727,11 @@ async def list_project_documents(
         has_previous=page > 1
     )
 
-    return PaginatedDocumentsResponse(
-        documents=documents,
-        pagination=pagination
+    # Serialize straight to JSON bytes; returning a Response skips FastAPI's
+    # per-request response_model validation
+    return Response(
+        PaginatedDocumentsResponse(documents=documents, pagination=pagination).model_dump_json(),
+        media_type="application/json",
     )
 
 
@@ -689,8 +740,8 @@ async def list_project_documents(
     response_model=DocumentResponse,
 )
 async def get_document(
-    project_uuid: str,
-    document_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -700,7 +751,7 @@ async def get_document(
             Document.uuid == document_uuid, 
             Document.project_uuid == project_uuid,
             Document.deleted_at.is_(None)
-        )
+        ).options(selectinload(Document.owner).load_only(User.id, User.name))
     )
     document = result.scalar_one_or_none()
 
@@ -720,8 +771,8 @@ async def get_document(
 
 @app.delete("/projects/{project_uuid}/documents/{document_uuid}")
 async def delete_document(
-    project_uuid: str,
-    document_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -807,7 +858,7 @@ async def delete_document(
 
 @app.delete("/delete-document/{document_uuid}")
 async def delete_document_legacy(
-    document_uuid: str,
+    document_uuid: UUIDStr,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -890,8 +941,8 @@ async def delete_document_legacy(
     response_model=List[DocumentExtractionJobResponse],
 )
 async def get_document_extraction_jobs(
-    project_uuid: str,
-    document_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
     filter_by_user: bool = False,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -922,40 +973,23 @@ async def get_document_extraction_jobs(
     )
     jobs = result.scalars().all()
 
-    # Get feedback statistics for each job
+    # Feedback statistics for every job in one grouped query, optionally
+    # restricted to the current user's ratings
+    stats = await DocumentExtractionJob.aggregate_feedback(
+        db, [job.uuid for job in jobs], user_id=user.id if filter_by_user else None
+    )
+
     job_responses = []
     for job in jobs:
-        # Get all feedback for this extraction job, optionally filtered by user
-        feedback_query = select(DocumentPageFeedback).where(
-            DocumentPageFeedback.extraction_job_uuid == job.uuid,
-            DocumentPageFeedback.deleted_at.is_(None)
-        )
-        
-        # Apply user filter if requested
-        if filter_by_user:
-            feedback_query = feedback_query.where(
-                DocumentPageFeedback.user_id == user.id
-            )
-        
-        feedback_result = await db.execute(feedback_query)
-        feedbacks = feedback_result.scalars().all()
-
-        # Calculate statistics
-        total_feedback_count = len(feedbacks)
-        pages_annotated = len(
-            set(f.page_number for f in feedbacks if f.rating is not None)
-        )
-
-        # Calculate average rating
-        ratings = [f.rating for f in feedbacks if f.rating is not None]
-        total_rating = round(sum(ratings) / len(ratings), 2) if ratings else None
+        pages_annotated, average_rating, total_feedback_count = stats.get(job.uuid, (0, None, 0))
+        total_rating = round(average_rating, 2) if average_rating is not None else None
 
         job_responses.append(
             DocumentExtractionJobResponse(
                 uuid=str(job.uuid),
                 document_uuid=str(job.document_uuid),
                 extractor=str(job.extractor),
-                status=ExtractionStatus(job.status),
+                status=job.status,
                 start_time=to_utc_isoformat(job.start_time) if job.start_time else None,
                 end_time=to_utc_isoformat(job.end_time) if job.end_time else None,
                 latency_ms=int(job.latency_ms or 0),
@@ -965,7 +999,7 @@ async def get_document_extraction_jobs(
                 total_feedback_count=total_feedback_count,
             )
         )
-    return job_responses
+    return Response(JOB_LIST_ADAPTER.dump_json(job_responses), media_type="application/json")
 
 
 @app.get(
@@ -973,9 +1007,9 @@ async def get_document_extraction_jobs(
     response_model=List[DocumentPageContentResponse],
 )
 async def get_extraction_job_pages(
-    project_uuid: str,
-    document_uuid: str,
-    job_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
+    job_uuid: UUIDStr,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -1025,8 +1059,8 @@ async def get_extraction_job_pages(
     response_model=List[DocumentPageContentResponse],
 )
 async def get_page_extractions(
-    project_uuid: str,
-    document_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
     page_number: int,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1042,38 +1076,27 @@ async def get_page_extractions(
     )
     if not doc_result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Document not found")
-    # Get all extraction jobs for this document
-    jobs_result = await db.execute(
-        select(DocumentExtractionJob).where(
+    # This page's content from every live extraction job, with the current
+    # user's feedback batch-loaded by selectinload (one IN query)
+    result = await db.execute(
+        select(DocumentPageContent)
+        .join(
+            DocumentExtractionJob,
+            DocumentExtractionJob.uuid == DocumentPageContent.extraction_job_uuid,
+        )
+        .where(
             DocumentExtractionJob.document_uuid == document_uuid,
-            DocumentExtractionJob.deleted_at.is_(None)
+            DocumentExtractionJob.deleted_at.is_(None),
+            DocumentPageContent.page_number == page_number,
+            DocumentPageContent.deleted_at.is_(None)
         )
-    )
-    jobs = jobs_result.scalars().all()
-    # Get page content for this specific page from all extraction jobs
-    page_contents = []
-    for job in jobs:
-        result = await db.execute(
-            select(DocumentPageContent).where(
-                DocumentPageContent.extraction_job_uuid == job.uuid,
-                DocumentPageContent.page_number == page_number,
-                DocumentPageContent.deleted_at.is_(None)
+        .options(
+            selectinload(
+                DocumentPageContent.feedbacks.and_(DocumentPageFeedback.user_id == user.id)
             )
         )
-        page_content = result.scalar_one_or_none()
-        if page_content:
-            page_contents.append(page_content)
-    # Get feedback for this page
-    feedback_result = await db.execute(
-        select(DocumentPageFeedback).where(
-            DocumentPageFeedback.document_uuid == document_uuid,
-            DocumentPageFeedback.page_number == page_number,
-            DocumentPageFeedback.deleted_at.is_(None)
-        )
     )
-    feedbacks = feedback_result.scalars().all()
-    # Create a mapping of extraction_job_uuid to feedback
-    feedback_map = {f.extraction_job_uuid: f for f in feedbacks}
+    page_contents = result.scalars().all()
     return [
         DocumentPageContentResponse(
             uuid=str(page.uuid),
@@ -1088,13 +1111,15 @@ async def get_page_extractions(
                 feedback_type=str(feedback.feedback_type),
                 rating=int(feedback.rating),
                 comment=str(feedback.comment),
+                user_id=feedback.user_id,
+                user_name=user.name,
                 created_at=to_utc_isoformat(feedback.created_at),
             )
             if feedback
             else None,
         )
         for page in page_contents
-        for feedback in [feedback_map.get(page.extraction_job_uuid)]
+        for feedback in [page.feedbacks[-1] if page.feedbacks else None]
     ]
 
 
@@ -1103,8 +1128,8 @@ async def get_page_extractions(
     response_model=DocumentPageFeedbackResponse,
 )
 async def submit_feedback(
-    project_uuid: str,
-    document_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
     feedback: DocumentPageFeedbackRequest,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1141,7 +1166,6 @@ async def submit_feedback(
                 existing.comment = feedback.comment
             # Update user info
             existing.user_id = user.id
-            existing.user_name = user.name
         else:
             # Create new feedback
             feedback_uuid = str(uuid.uuid4())
@@ -1154,7 +1178,6 @@ async def submit_feedback(
                 rating=feedback.rating,
                 comment=feedback.comment,
                 user_id=user.id,
-                user_name=user.name,
             )
             db.add(new_feedback)
         await db.commit()
@@ -1169,7 +1192,7 @@ async def submit_feedback(
                 rating=int(existing.rating),
                 comment=str(existing.comment),
                 user_id=existing.user_id,
-                user_name=existing.user_name,
+                user_name=user.name,
                 created_at=to_utc_isoformat(existing.created_at),
             )
         else:
@@ -1184,7 +1207,7 @@ async def submit_feedback(
                 rating=int(new_feedback.rating),
                 comment=str(new_feedback.comment),
                 user_id=new_feedback.user_id,
-                user_name=new_feedback.user_name,
+                user_name=user.name,
                 created_at=to_utc_isoformat(new_feedback.created_at),
             )
 
@@ -1198,8 +1221,8 @@ async def submit_feedback(
     response_model=List[DocumentPageFeedbackResponse],
 )
 async def get_page_feedback(
-    project_uuid: str,
-    document_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
     page_number: int,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1221,7 +1244,7 @@ async def get_page_feedback(
                 DocumentPageFeedback.document_uuid == document_uuid,
                 DocumentPageFeedback.page_number == page_number,
                 DocumentPageFeedback.deleted_at.is_(None)
-            )
+            ).options(selectinload(DocumentPageFeedback.user).load_only(User.id, User.name))
         )
         feedbacks = result.scalars().all()
         return [
@@ -1249,9 +1272,9 @@ async def get_page_feedback(
     response_model=List[UserRatingBreakdown],
 )
 async def get_rating_breakdown(
-    project_uuid: str,
-    document_uuid: str,
-    job_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
+    job_uuid: UUIDStr,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -1284,7 +1307,9 @@ async def get_rating_breakdown(
             select(DocumentPageFeedback).where(
                 DocumentPageFeedback.extraction_job_uuid == job_uuid,
                 DocumentPageFeedback.deleted_at.is_(None)
-            ).order_by(DocumentPageFeedback.created_at.desc())
+            )
+            .order_by(DocumentPageFeedback.created_at.desc())
+            .options(selectinload(DocumentPageFeedback.user).load_only(User.id, User.name))
         )
         feedbacks = feedback_result.scalars().all()
         
@@ -1317,7 +1342,7 @@ async def get_rating_breakdown(
                 latest_rated_at=to_utc_isoformat(latest.created_at),
             ))
         
-        return breakdown
+        return Response(RATING_BREAKDOWN_LIST_ADAPTER.dump_json(breakdown), media_type="application/json")
         
     except HTTPException:
         raise
@@ -1330,10 +1355,10 @@ async def get_rating_breakdown(
     "/projects/{project_uuid}/documents/{document_uuid}/pages/{page_number}/average-rating",
 )
 async def get_page_average_rating(
-    project_uuid: str,
-    document_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
     page_number: int,
-    extraction_job_uuid: str,
+    extraction_job_uuid: UUIDStr,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -1397,9 +1422,9 @@ async def get_page_average_rating(
     response_model=List[AnnotationListItem],
 )
 async def get_annotations_list(
-    project_uuid: str,
-    document_uuid: str,
-    extractor_uuid: Optional[str] = None,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
+    extractor_uuid: Optional[UUIDStr] = None,
     user_id: Optional[int] = None,
     page_number: Optional[int] = None,
     search: Optional[str] = None,
@@ -1444,25 +1469,28 @@ async def get_annotations_list(
                 )
             )
         
-        query = query.order_by(Annotation.page_number.asc(), Annotation.created_at.desc())
+        query = query.order_by(Annotation.page_number.asc(), Annotation.created_at.desc()).options(
+            selectinload(Annotation.user).load_only(User.id, User.name)
+        )
         
         result = await db.execute(query)
         rows = result.all()
         
-        return [
+        items = [
             AnnotationListItem(
-                uuid=str(annotation.uuid),
-                page_number=int(annotation.page_number),
+                uuid=annotation.uuid,
+                page_number=annotation.page_number,
                 extractor=job.extractor,
-                extraction_job_uuid=str(annotation.extraction_job_uuid),
+                extraction_job_uuid=annotation.extraction_job_uuid,
                 user_id=annotation.user_id,
                 user_name=annotation.user_name or "Unknown User",
-                text=str(annotation.text),
-                comment=str(annotation.comment),
+                text=annotation.text,
+                comment=annotation.comment,
                 created_at=to_utc_isoformat(annotation.created_at),
             )
             for annotation, job in rows
         ]
+        return Response(ANNOTATION_ITEM_LIST_ADAPTER.dump_json(items), media_type="application/json")
         
     except HTTPException:
         raise
@@ -1473,7 +1501,7 @@ async def get_annotations_list(
 
 # Robust, auth-protected download endpoint that serves files from S3
 @app.get("/projects/{project_uuid}/documents/{document_uuid}/pdf-load")
-async def download_document_file(project_uuid: str, document_uuid: str, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def download_document_file(project_uuid: UUIDStr, document_uuid: UUIDStr, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # Allow any authenticated user to download within the same project context
     result = await db.execute(
         select(Document).where(
@@ -1538,6 +1566,28 @@ async def download_document_file(project_uuid: str, document_uuid: str, db: Asyn
             raise HTTPException(status_code=404, detail="File not found on server")
 
 # -------------------- Annotations API --------------------
+def _annotation_response(anno: Annotation) -> AnnotationResponse:
+    """Build an AnnotationResponse straight from the ORM row.
+
+    Column types already match the schema, so values are passed through
+    as-is; a NULL extraction_job_uuid (legacy rows) stays None instead of
+    becoming the string "None".
+    """
+    return AnnotationResponse(
+        uuid=anno.uuid,
+        document_uuid=anno.document_uuid,
+        extraction_job_uuid=anno.extraction_job_uuid,
+        page_number=anno.page_number,
+        text=anno.text,
+        comment=anno.comment,
+        selection_start=anno.selection_start,
+        selection_end=anno.selection_end,
+        user_id=anno.user_id,
+        user_name=anno.user_name,
+        created_at=to_utc_isoformat(anno.created_at),
+    )
+
+
 @app.post("/api/annotations", response_model=AnnotationResponse)
 async def create_annotation(
     payload: AnnotationCreateRequest,
@@ -1546,25 +1596,28 @@ async def create_annotation(
 ):
     try:
         # Ensure document exists (visible to all users)
-        doc_result = await db.execute(
-            select(Document).where(
-                Document.uuid == payload.documentId,
-                Document.deleted_at.is_(None)
+        doc_exists = await db.scalar(
+            select(
+                exists().where(
+                    Document.uuid == payload.documentId,
+                    Document.deleted_at.is_(None)
+                )
             )
         )
-        doc = doc_result.scalar_one_or_none()
-        if not doc:
+        if not doc_exists:
             raise HTTPException(status_code=404, detail="Document not found")
 
         # Ensure extraction job exists and belongs to the same document
-        job_result = await db.execute(
-            select(DocumentExtractionJob).where(
-                DocumentExtractionJob.uuid == payload.extractionJobUuid,
-                DocumentExtractionJob.deleted_at.is_(None)
+        job_exists = await db.scalar(
+            select(
+                exists().where(
+                    DocumentExtractionJob.uuid == payload.extractionJobUuid,
+                    DocumentExtractionJob.document_uuid == payload.documentId,
+                    DocumentExtractionJob.deleted_at.is_(None)
+                )
             )
         )
-        job = job_result.scalar_one_or_none()
-        if not job or job.document_uuid != payload.documentId:
+        if not job_exists:
             raise HTTPException(status_code=404, detail="Extraction job not found for document")
 
         anno_uuid = str(uuid.uuid4())
@@ -1578,24 +1631,13 @@ async def create_annotation(
             selection_start=int(payload.selectionStart),
             selection_end=int(payload.selectionEnd),
             user_id=user.id,
-            user_name=user.name,
+            user=user,
         )
         db.add(anno)
+        # created_at is stamped at flush; a refresh here would expire the
+        # user relationship the response reads
         await db.commit()
-        await db.refresh(anno)
-        return AnnotationResponse(
-            uuid=str(anno.uuid),
-            document_uuid=str(anno.document_uuid),
-            extraction_job_uuid=str(anno.extraction_job_uuid),
-            page_number=int(anno.page_number),
-            text=str(anno.text),
-            comment=str(anno.comment),
-            selection_start=int(anno.selection_start),
-            selection_end=int(anno.selection_end),
-            user_id=anno.user_id,
-            user_name=anno.user_name,
-            created_at=to_utc_isoformat(anno.created_at),
-        )
+        return _annotation_response(anno)
     except HTTPException:
         raise
     except Exception as e:
@@ -1606,21 +1648,23 @@ async def create_annotation(
 
 @app.get("/api/annotations", response_model=List[AnnotationResponse])
 async def list_annotations(
-    documentId: str,
-    extractionJobUuid: str | None = None,
+    documentId: UUIDStr,
+    extractionJobUuid: UUIDStr | None = None,
     pageNumber: int | None = None,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     try:
         # Ensure document exists
-        doc_result = await db.execute(
-            select(Document).where(
-                Document.uuid == documentId,
-                Document.deleted_at.is_(None)
+        doc_exists = await db.scalar(
+            select(
+                exists().where(
+                    Document.uuid == documentId,
+                    Document.deleted_at.is_(None)
+                )
             )
         )
-        if not doc_result.scalar_one_or_none():
+        if not doc_exists:
             raise HTTPException(status_code=404, detail="Document not found")
 
         query = select(Annotation).where(
@@ -1631,26 +1675,16 @@ async def list_annotations(
             query = query.where(Annotation.extraction_job_uuid == extractionJobUuid)
         if pageNumber is not None:
             query = query.where(Annotation.page_number == pageNumber)
-        query = query.order_by(Annotation.created_at.asc())
+        query = query.order_by(Annotation.created_at.asc()).options(
+            selectinload(Annotation.user).load_only(User.id, User.name)
+        )
 
         result = await db.execute(query)
         annos = result.scalars().all()
-        return [
-            AnnotationResponse(
-                uuid=str(a.uuid),
-                document_uuid=str(a.document_uuid),
-                extraction_job_uuid=str(a.extraction_job_uuid),
-                page_number=int(a.page_number),
-                text=str(a.text),
-                comment=str(a.comment),
-                selection_start=int(a.selection_start),
-                selection_end=int(a.selection_end),
-                user_id=a.user_id,
-                user_name=a.user_name,
-                created_at=to_utc_isoformat(a.created_at),
-            )
-            for a in annos
-        ]
+        return Response(
+            ANNOTATION_LIST_ADAPTER.dump_json([_annotation_response(a) for a in annos]),
+            media_type="application/json",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -1660,7 +1694,7 @@ async def list_annotations(
 
 @app.delete("/api/annotations/{annotation_uuid}")
 async def delete_annotation(
-    annotation_uuid: str,
+    annotation_uuid: UUIDStr,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -1692,14 +1726,25 @@ async def delete_annotation(
         raise HTTPException(status_code=500, detail="Failed to delete annotation")
 
 
+def _queue_retry(job_uuid: str, document_uuid: str, file_path: str, extractor: str) -> None:
+    """Queue the Celery task for a retried job (runs as a background task)."""
+    try:
+        process_document_with_extractor.delay(job_uuid, document_uuid, file_path, extractor)
+        logger.info(f"Successfully queued retry task for job {job_uuid}")
+    except Exception as task_err:
+        # The job is already persisted as NOT_STARTED, so it can be retried later
+        logger.error(f"Failed to queue retry task for job {job_uuid}: {task_err}")
+
+
 @app.post(
     "/projects/{project_uuid}/documents/{document_uuid}/extraction-jobs/{job_uuid}/retry",
     response_model=dict
 )
 async def retry_extraction_job(
-    project_uuid: str,
-    document_uuid: str,
-    job_uuid: str,
+    project_uuid: UUIDStr,
+    document_uuid: UUIDStr,
+    job_uuid: UUIDStr,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -1748,36 +1793,34 @@ async def retry_extraction_job(
                 detail=f"Cannot retry job with status: {job.status}"
             )
 
-        # Reset job status and clear previous results
-        job.status = ExtractionStatus.NOT_STARTED
-        job.start_time = None
-        job.end_time = None
-        job.latency_ms = None
-        job.cost = None
-
-        # Soft delete existing page content for this job
+        # Reset job status and soft delete its page content in one statement:
+        # the job UPDATE runs as a CTE whose RETURNING feeds the page UPDATE.
+        reset_job = (
+            update(DocumentExtractionJob)
+            .where(DocumentExtractionJob.uuid == job_uuid)
+            .values(
+                status=ExtractionStatus.NOT_STARTED,
+                start_time=None,
+                end_time=None,
+                latency_ms=None,
+                cost=None,
+            )
+            .returning(DocumentExtractionJob.uuid)
+            .cte("reset_job")
+        )
         await db.execute(
             update(DocumentPageContent)
-            .where(DocumentPageContent.extraction_job_uuid == job_uuid)
-            .values(deleted_at=datetime.now(timezone.utc))
+            .where(DocumentPageContent.extraction_job_uuid.in_(select(reset_job.c.uuid)))
+            .values(deleted_at=func.now())
+            .execution_options(synchronize_session=False)
         )
 
         await db.commit()
 
-        # Queue the retry task
-        try:
-            from src.tasks import process_document_with_extractor
-            process_document_with_extractor.delay(
-                job_uuid, 
-                document_uuid, 
-                document.filepath, 
-                job.extractor
-            )
-            logger.info(f"Successfully queued retry task for job {job_uuid}")
-        except Exception as task_err:
-            logger.error(f"Failed to queue retry task: {task_err}")
-            # Still return success since the job status was reset
-            # The job can be manually retried later
+        # Publish to the broker after the response is sent
+        background_tasks.add_task(
+            _queue_retry, job_uuid, document_uuid, document.filepath, job.extractor
+        )
 
         return {
             "message": "Extraction job retry initiated",
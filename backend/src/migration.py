@@ -5,7 +5,7 @@ Database migration script to add user_id columns to existing projects and docume
 This script should be run once after deploying the security updates.
 It will:
 1. Add user_id column to projects and documents tables if they don't exist
-2. Add user tracking columns (user_id, user_name) to document_page_feedback and annotations tables
+2. Add user tracking columns (user_id) to document_page_feedback and annotations tables
 3. Create performance indexes for user tracking columns
 4. Create a default admin user if no users exist
 5. Assign all existing projects and documents to the default admin user
@@ -16,40 +16,147 @@ Usage: python migration.py
 """
 
 import asyncio
+import functools
 import sqlite3
-import os
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
-from .db import get_db, engine_async
-from .models import User, Project, Document
+from sqlalchemy import MetaData, Uuid, insert, literal, select, text
+from sqlalchemy.dialects.sqlite import dialect as sqlite_dialect
+from sqlalchemy.schema import CreateIndex, CreateTable
+from .db import Base
+from .models import Annotation, Document, DocumentExtractionJob, DocumentPageFeedback, Project, User
 from .auth.security import hash_password
-from .constants import ADMIN_NAME, ADMIN_EMAIL, ADMIN_PASSWORD
+from .constants import ADMIN_NAME, ADMIN_EMAIL, ADMIN_PASSWORD, FORCE_ADMIN_PASSWORD_RESET
 
 DEFAULT_ADMIN_NAME = ADMIN_NAME or "Admin"
 DEFAULT_ADMIN_EMAIL = ADMIN_EMAIL or "admin@example.com"
 DEFAULT_ADMIN_PASSWORD = ADMIN_PASSWORD or "admin123"
 
-async def run_migration():
-    """Run the database migration"""
-    print("Starting database migration...")
-    
-    # Locate the SQLite DB file, prioritizing the path next to this script
+# Bump whenever COLUMN_MIGRATIONS or the index/constraint steps change;
+# stored in SQLite's PRAGMA user_version once a migration completes
+SCHEMA_VERSION = 3
+
+# (index name, table) pairs indexed on user_id for per-user lookups
+USER_ID_INDEXES = [
+    ("idx_feedback_user_id", "document_page_feedback"),
+    ("idx_annotations_user_id", "annotations"),
+]
+
+# Partial indexes over live (deleted_at IS NULL) rows declared on the models;
+# create_all never adds indexes to tables that already exist, so existing
+# databases get them here
+COMPOSITE_INDEXES = [
+    index
+    for table in (
+        Project.__table__,
+        Document.__table__,
+        DocumentExtractionJob.__table__,
+        DocumentPageFeedback.__table__,
+        Annotation.__table__,
+    )
+    for index in table.indexes
+    if index.name in (
+        "ix_projects_active",
+        "ix_documents_active",
+        "ix_extraction_jobs_document_active",
+        "ix_feedback_doc_job_page_active",
+        "ix_annotations_doc_job_page_active",
+    )
+]
+
+# Partial unique index enforcing one rating per user/page/extractor
+RATING_UNIQUE_INDEX = "uq_user_page_extractor_rating"
+
+# Columns added after each table's initial release: (column, column definition).
+# Missing ones are appended with ALTER TABLE ... ADD COLUMN in this order.
+COLUMN_MIGRATIONS = {
+    "projects": [
+        ("user_id", "INTEGER"),
+        ("file_upload_type", "VARCHAR"),
+        ("deleted_at", "DATETIME"),
+    ],
+    "documents": [
+        ("user_id", "INTEGER"),
+        # default to 'pdf' for existing rows to satisfy NOT NULL
+        ("file_type", "VARCHAR NOT NULL DEFAULT 'pdf'"),
+        ("page_count", "INTEGER"),
+        ("project_uuid", "VARCHAR"),
+        ("deleted_at", "DATETIME"),
+    ],
+    "document_extraction_jobs": [
+        ("deleted_at", "DATETIME"),
+    ],
+    "document_page_content": [
+        ("deleted_at", "DATETIME"),
+    ],
+    "document_page_feedback": [
+        ("deleted_at", "DATETIME"),
+        ("user_id", "INTEGER REFERENCES users(id)"),
+    ],
+    "annotations": [
+        ("deleted_at", "DATETIME"),
+        ("user_id", "INTEGER REFERENCES users(id)"),
+        ("extraction_job_uuid", "VARCHAR"),
+        ("page_number", "INTEGER"),
+    ],
+}
+
+# Tables rebuilt from their model definition (move-and-copy) instead of being
+# patched column by column, so NOT NULL/CHECK changes and drops can land too
+REBUILT_TABLES = {
+    "users": User.__table__,
+}
+
+def _rebuild_table_statements(table, existing_columns):
+    """Alembic batch-style move-and-copy: create the model's table under a
+    temporary name, copy the rows across, drop the old table, rename the new
+    one into place and recreate its indexes"""
+    dialect = sqlite_dialect()
+    temp_name = f"_batch_temp_{table.name}"
+    temp_table = table.to_metadata(MetaData(), name=temp_name)
+
+    select_exprs = []
+    for column in table.columns:
+        default = column.default.arg if column.default is not None and column.default.is_scalar else None
+        default_sql = literal(default, column.type).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        if column.name not in existing_columns:
+            select_exprs.append(str(default_sql))
+        elif not column.nullable and default is not None:
+            select_exprs.append(f"COALESCE({column.name}, {default_sql})")
+        else:
+            select_exprs.append(column.name)
+
+    column_names = ", ".join(column.name for column in table.columns)
+    return [
+        str(CreateTable(temp_table).compile(dialect=dialect)).strip(),
+        f"INSERT INTO {temp_name} ({column_names}) SELECT {', '.join(select_exprs)} FROM {table.name}",
+        f"DROP TABLE {table.name}",
+        f"ALTER TABLE {temp_name} RENAME TO {table.name}",
+        *(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)) for index in table.indexes),
+    ]
+
+@functools.lru_cache(maxsize=1)
+def _find_db_file():
+    """Locate the SQLite DB file, prioritizing the path next to this script"""
     here = Path(__file__).resolve()
     src_db_path = here.with_name("pdf-extraction.db")  # .../src/pdf-extraction.db
     app_root_db_path = src_db_path.parent.parent / "pdf-extraction.db"  # .../pdf-extraction.db
 
     candidate_paths = [
-        str(src_db_path),                        # preferred (same dir as running app models)
-        str(app_root_db_path),                   # app root (container path)
-        "/app/src/pdf-extraction.db",          # container explicit
-        "/app/pdf-extraction.db",              # container alt
-        "backend/src/pdf-extraction.db",       # repo-relative heuristic
-        "./pdf-extraction.db",                 # CWD
-        "pdf-extraction.db",                   # fallback
+        src_db_path,                             # preferred (same dir as running app models)
+        app_root_db_path,                        # app root (container path)
+        Path("/app/src/pdf-extraction.db"),      # container explicit
+        Path("/app/pdf-extraction.db"),          # container alt
+        Path("backend/src/pdf-extraction.db"),   # repo-relative heuristic
+        Path("pdf-extraction.db"),               # CWD / fallback
     ]
+    return next((str(p) for p in candidate_paths if p.is_file()), None)
+
+async def run_migration():
+    """Run the database migration"""
+    print("Starting database migration...")
 
-    db_file = next((p for p in candidate_paths if os.path.exists(p)), None)
+    db_file = _find_db_file()
     if db_file:
         print(f"Found SQLite database: {db_file}")
         await migrate_sqlite(db_file)
@@ -59,447 +166,396 @@ async def run_migration():
     
     print("Migration completed successfully!")
 
-async def migrate_sqlite(db_file: str):
-    """Migrate SQLite database"""
-    # First, check if columns already exist using raw SQL
-    conn = sqlite3.connect(db_file)
-    cursor = conn.cursor()
+def _patch_existing_schema(conn, cursor):
+    """Bring an existing database's tables, indexes and constraints up to date"""
+    # Write-optimised pragmas for the duration of the migration: WAL journal,
+    # no per-statement fsync, in-memory temp storage and an exclusive lock.
+    # journal_mode must be switched outside a transaction.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
     
     try:
-        # Check if user_id column exists in projects table
-        cursor.execute("PRAGMA table_info(projects)")
-        projects_columns = [col[1] for col in cursor.fetchall()]
-        
-        # Check if user_id column exists in documents table
-        cursor.execute("PRAGMA table_info(documents)")
-        documents_columns = [col[1] for col in cursor.fetchall()]
-        
-        print(f"Projects table columns: {projects_columns}")
-        print(f"Documents table columns: {documents_columns}")
-        
-        # Add user_id column to projects if it doesn't exist
-        if 'user_id' not in projects_columns:
-            print("Adding user_id column to projects table...")
-            cursor.execute("ALTER TABLE projects ADD COLUMN user_id INTEGER")
-            print("✓ Added user_id column to projects table")
-        else:
-            print("user_id column already exists in projects table")
-
-        # Add owner_name column to projects if it doesn't exist
-        if 'owner_name' not in projects_columns:
-            print("Adding owner_name column to projects table...")
-            cursor.execute("ALTER TABLE projects ADD COLUMN owner_name VARCHAR")
-            print("✓ Added owner_name column to projects table")
-        else:
-            print("owner_name column already exists in projects table")
-
-        # Add file_upload_type column to projects if it doesn't exist
-        if 'file_upload_type' not in projects_columns:
-            print("Adding file_upload_type column to projects table...")
-            cursor.execute("ALTER TABLE projects ADD COLUMN file_upload_type VARCHAR")
-            print("✓ Added file_upload_type column to projects table")
-        else:
-            print("file_upload_type column already exists in projects table")
-
-        # Add deleted_at column to projects if it doesn't exist
-        if 'deleted_at' not in projects_columns:
-            print("Adding deleted_at column to projects table...")
-            cursor.execute("ALTER TABLE projects ADD COLUMN deleted_at DATETIME")
-            print("✓ Added deleted_at column to projects table")
-        else:
-            print("deleted_at column already exists in projects table")
-        
-        # Add user_id column to documents if it doesn't exist
-        if 'user_id' not in documents_columns:
-            print("Adding user_id column to documents table...")
-            cursor.execute("ALTER TABLE documents ADD COLUMN user_id INTEGER")
-            print("✓ Added user_id column to documents table")
-        else:
-            print("user_id column already exists in documents table")
-
-        # Add file_type column to documents if it doesn't exist
-        if 'file_type' not in documents_columns:
-            print("Adding file_type column to documents table...")
-            # default to 'pdf' for existing rows to satisfy NOT NULL
-            cursor.execute("ALTER TABLE documents ADD COLUMN file_type VARCHAR NOT NULL DEFAULT 'pdf'")
-            print("✓ Added file_type column to documents table")
-        else:
-            print("file_type column already exists in documents table")
-
-        # Add page_count column to documents if it doesn't exist
-        if 'page_count' not in documents_columns:
-            print("Adding page_count column to documents table...")
-            cursor.execute("ALTER TABLE documents ADD COLUMN page_count INTEGER")
-            print("✓ Added page_count column to documents table")
-        else:
-            print("page_count column already exists in documents table")
-
-        # Add project_uuid column to documents if it doesn't exist
-        if 'project_uuid' not in documents_columns:
-            print("Adding project_uuid column to documents table...")
-            cursor.execute("ALTER TABLE documents ADD COLUMN project_uuid VARCHAR")
-            print("✓ Added project_uuid column to documents table")
-        else:
-            print("project_uuid column already exists in documents table")
-        
-        # Add owner_name column to documents if it doesn't exist
-        if 'owner_name' not in documents_columns:
-            print("Adding owner_name column to documents table...")
-            cursor.execute("ALTER TABLE documents ADD COLUMN owner_name VARCHAR")
-            print("✓ Added owner_name column to documents table")
-        else:
-            print("owner_name column already exists in documents table")
-        
-        # Add deleted_at column to documents if it doesn't exist
-        if 'deleted_at' not in documents_columns:
-            print("Adding deleted_at column to documents table...")
-            cursor.execute("ALTER TABLE documents ADD COLUMN deleted_at DATETIME")
-            print("✓ Added deleted_at column to documents table")
-        else:
-            print("deleted_at column already exists in documents table")
-        
-        # Add deleted_at column to document_extraction_jobs if it doesn't exist
-        cursor.execute("PRAGMA table_info(document_extraction_jobs)")
-        extraction_jobs_columns = [col[1] for col in cursor.fetchall()]
-        if 'deleted_at' not in extraction_jobs_columns:
-            print("Adding deleted_at column to document_extraction_jobs table...")
-            cursor.execute("ALTER TABLE document_extraction_jobs ADD COLUMN deleted_at DATETIME")
-            print("✓ Added deleted_at column to document_extraction_jobs table")
-        else:
-            print("deleted_at column already exists in document_extraction_jobs table")
-
-        # Add deleted_at column to document_page_content if it doesn't exist
-        cursor.execute("PRAGMA table_info(document_page_content)")
-        page_content_columns = [col[1] for col in cursor.fetchall()]
-        if 'deleted_at' not in page_content_columns:
-            print("Adding deleted_at column to document_page_content table...")
-            cursor.execute("ALTER TABLE document_page_content ADD COLUMN deleted_at DATETIME")
-            print("✓ Added deleted_at column to document_page_content table")
-        else:
-            print("deleted_at column already exists in document_page_content table")
-
-        # Add deleted_at column to document_page_feedback if it doesn't exist
-        cursor.execute("PRAGMA table_info(document_page_feedback)")
-        page_feedback_columns = [col[1] for col in cursor.fetchall()]
-        if 'deleted_at' not in page_feedback_columns:
-            print("Adding deleted_at column to document_page_feedback table...")
-            cursor.execute("ALTER TABLE document_page_feedback ADD COLUMN deleted_at DATETIME")
-            print("✓ Added deleted_at column to document_page_feedback table")
-        else:
-            print("deleted_at column already exists in document_page_feedback table")
-
-        # Add user tracking columns to document_page_feedback if they don't exist
-        if 'user_id' not in page_feedback_columns:
-            print("Adding user_id column to document_page_feedback table...")
-            cursor.execute("ALTER TABLE document_page_feedback ADD COLUMN user_id INTEGER REFERENCES users(id)")
-            print("✓ Added user_id column to document_page_feedback table")
-        else:
-            print("user_id column already exists in document_page_feedback table")
-
-        if 'user_name' not in page_feedback_columns:
-            print("Adding user_name column to document_page_feedback table...")
-            cursor.execute("ALTER TABLE document_page_feedback ADD COLUMN user_name TEXT")
-            print("✓ Added user_name column to document_page_feedback table")
-        else:
-            print("user_name column already exists in document_page_feedback table")
-
-        # Add deleted_at column to annotations if it doesn't exist
-        cursor.execute("PRAGMA table_info(annotations)")
-        annotations_columns = [col[1] for col in cursor.fetchall()]
-        if 'deleted_at' not in annotations_columns:
-            print("Adding deleted_at column to annotations table...")
-            cursor.execute("ALTER TABLE annotations ADD COLUMN deleted_at DATETIME")
-            print("✓ Added deleted_at column to annotations table")
-        else:
-            print("deleted_at column already exists in annotations table")
-
-        # Add user tracking columns to annotations if they don't exist
-        if 'user_id' not in annotations_columns:
-            print("Adding user_id column to annotations table...")
-            cursor.execute("ALTER TABLE annotations ADD COLUMN user_id INTEGER REFERENCES users(id)")
-            print("✓ Added user_id column to annotations table")
-        else:
-            print("user_id column already exists in annotations table")
-
-        if 'user_name' not in annotations_columns:
-            print("Adding user_name column to annotations table...")
-            cursor.execute("ALTER TABLE annotations ADD COLUMN user_name TEXT")
-            print("✓ Added user_name column to annotations table")
-        else:
-            print("user_name column already exists in annotations table")
-        
-        # Add name/approval/role/org columns to users if they don't exist
-        cursor.execute("PRAGMA table_info(users)")
-        users_columns = [col[1] for col in cursor.fetchall()]
-        if 'name' not in users_columns:
-            print("Adding name column to users table...")
-            cursor.execute("ALTER TABLE users ADD COLUMN name VARCHAR")
-            print("\u2713 Added name column to users table")
-        else:
-            print("name column already exists in users table")
-
-        if 'is_approved' not in users_columns:
-            print("Adding is_approved column to users table...")
-            cursor.execute("ALTER TABLE users ADD COLUMN is_approved BOOLEAN DEFAULT 0")
-            print("\u2713 Added is_approved column to users table")
-        else:
-            print("is_approved column already exists in users table")
-
-        if 'role' not in users_columns:
-            print("Adding role column to users table...")
-            cursor.execute("ALTER TABLE users ADD COLUMN role VARCHAR DEFAULT 'user'")
-            print("\u2713 Added role column to users table")
-        else:
-            print("role column already exists in users table")
-
-        if 'organization_name' not in users_columns:
-            print("Adding organization_name column to users table...")
-            cursor.execute("ALTER TABLE users ADD COLUMN organization_name VARCHAR")
-            print("\u2713 Added organization_name column to users table")
+        # Snapshot the current columns of every table we patch in one query,
+        # joining sqlite_master against the pragma_table_info() table function.
+        # Table names are bound parameters, so the statement is a plain
+        # prepared SELECT rather than string-built SQL.
+        patched_tables = [*COLUMN_MIGRATIONS, *REBUILT_TABLES]
+        placeholders = ", ".join("?" for _ in patched_tables)
+        existing_columns = {table: set() for table in patched_tables}
+        for table, column in cursor.execute(f"""
+            SELECT m.name, p.name
+            FROM sqlite_master m JOIN pragma_table_info(m.name) p
+            WHERE m.type='table' AND m.name IN ({placeholders})
+        """, patched_tables):
+            existing_columns[table].add(column)
+
+        # Collect only the DDL this database still needs
+        ddl_statements = []
+        for table, columns in COLUMN_MIGRATIONS.items():
+            if not existing_columns[table]:
+                # Table doesn't exist yet; create_all below builds it with the full schema
+                print(f"{table} table not found, skipping column checks")
+                continue
+            for column, ddl in columns:
+                if column not in existing_columns[table]:
+                    print(f"Adding {column} column to {table} table...")
+                    ddl_statements.append(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+        for table_name, table in REBUILT_TABLES.items():
+            current_columns = existing_columns[table_name]
+            if not current_columns:
+                print(f"{table_name} table not found, skipping column checks")
+                continue
+            missing = [column.name for column in table.columns if column.name not in current_columns]
+            if not missing:
+                continue
+            extra = current_columns - set(table.columns.keys())
+            if extra:
+                # A rebuild would silently drop these; leave the table for a manual fix
+                print(f"⚠️  {table_name} has columns not in the model ({', '.join(sorted(extra))}); skipping rebuild")
+                continue
+            print(f"Rebuilding {table_name} table to add {', '.join(missing)}...")
+            ddl_statements.extend(_rebuild_table_statements(table, current_columns))
+
+        # One sqlite_master read decides which of our indexes still need creating
+        managed_indexes = (
+            [index_name for index_name, _ in USER_ID_INDEXES]
+            + [index.name for index in COMPOSITE_INDEXES]
+            + [RATING_UNIQUE_INDEX]
+        )
+        placeholders = ", ".join("?" for _ in managed_indexes)
+        existing_indexes = {
+            name for (name,) in cursor.execute(
+                f"SELECT name FROM sqlite_master WHERE type='index' AND name IN ({placeholders})",
+                managed_indexes,
+            )
+        }
+
+        # Indexes for the user tracking columns; tables that gain an index
+        # are ANALYZEd at the end so the planner has stats for it
+        analyze_tables = set()
+        for index_name, table in USER_ID_INDEXES:
+            if existing_columns[table] and index_name not in existing_indexes:
+                ddl_statements.append(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}(user_id)")
+                analyze_tables.add(table)
+        for index in COMPOSITE_INDEXES:
+            if existing_columns.get(index.table.name) and index.name not in existing_indexes:
+                ddl_statements.append(str(CreateIndex(index, if_not_exists=True).compile(dialect=sqlite_dialect())))
+                analyze_tables.add(index.table.name)
+
+        # Run the whole batch through one executescript call (one parse pass)
+        # inside a single transaction so it shares one commit
+        if ddl_statements:
+            cursor.executescript(
+                "BEGIN IMMEDIATE;\n" + ";\n".join(ddl_statements) + ";\nCOMMIT;"
+            )
+            print(f"✓ Applied {len(ddl_statements)} schema statements")
         else:
-            print("organization_name column already exists in users table")
+            print("Schema columns and indexes already up to date")
 
-        if 'organization_id' not in users_columns:
-            print("Adding organization_id column to users table...")
-            cursor.execute("ALTER TABLE users ADD COLUMN organization_id VARCHAR")
-            print("\u2713 Added organization_id column to users table")
-        else:
-            print("organization_id column already exists in users table")
+        # The rating cleanup + unique index below share a second transaction
+        cursor.execute("BEGIN IMMEDIATE")
 
-        if 'last_login' not in users_columns:
-            print("Adding last_login column to users table...")
-            cursor.execute("ALTER TABLE users ADD COLUMN last_login DATETIME")
-            print("\u2713 Added last_login column to users table")
-        else:
-            print("last_login column already exists in users table")
-
-        # Ensure annotations table has new columns
-        cursor.execute("PRAGMA table_info(annotations)")
-        annotations_columns = [col[1] for col in cursor.fetchall()]
-        print(f"Annotations table columns: {annotations_columns}")
+        # Add unique constraint for document_page_feedback ratings
+        print("Adding unique constraint for document_page_feedback ratings...")
 
-        if 'extraction_job_uuid' not in annotations_columns:
-            print("Adding extraction_job_uuid column to annotations table...")
-            cursor.execute("ALTER TABLE annotations ADD COLUMN extraction_job_uuid VARCHAR")
-            print("\u2713 Added extraction_job_uuid column to annotations table")
-        else:
-            print("extraction_job_uuid column already exists in annotations table")
+        # Once the constraint exists duplicates are impossible and the
+        # full-table duplicate scan can be skipped
+        constraint_exists = RATING_UNIQUE_INDEX in existing_indexes
 
-        if 'page_number' not in annotations_columns:
-            print("Adding page_number column to annotations table...")
-            cursor.execute("ALTER TABLE annotations ADD COLUMN page_number INTEGER")
-            print("\u2713 Added page_number column to annotations table")
+        if constraint_exists:
+            print("ℹ️  Rating unique constraint already exists")
         else:
-            print("page_number column already exists in annotations table")
-
-        # Create indexes for better query performance
-        print("Creating indexes for user tracking columns...")
-        try:
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user_id ON document_page_feedback(user_id)")
-            print("✓ Created index on document_page_feedback.user_id")
-        except Exception as e:
-            print(f"Note: Index creation skipped (may already exist): {e}")
-        
-        try:
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_annotations_user_id ON annotations(user_id)")
-            print("✓ Created index on annotations.user_id")
-        except Exception as e:
-            print(f"Note: Index creation skipped (may already exist): {e}")
-
-        # Add unique constraint for document_page_feedback ratings
-        print("Adding unique constraint for document_page_feedback ratings...")
-        
-        # Check for existing duplicates first
-        cursor.execute("""
-            SELECT COUNT(*) as total_duplicates
-            FROM (
-                SELECT document_uuid, page_number, extraction_job_uuid, user_id, COUNT(*) as cnt
-                FROM document_page_feedback
-                WHERE deleted_at IS NULL AND user_id IS NOT NULL
-                GROUP BY document_uuid, page_number, extraction_job_uuid, user_id
-                HAVING COUNT(*) > 1
-            ) duplicates
-        """)
-        duplicate_count = cursor.fetchone()[0]
-        
-        if duplicate_count > 0:
-            print(f"⚠️  Found {duplicate_count} duplicate rating groups")
-            print("🧹 Cleaning up duplicates (keeping most recent rating per user/page/extractor)...")
-            
-            # Delete duplicate ratings, keeping only the most recent one
+            # Check for existing duplicates first
             cursor.execute("""
-                DELETE FROM document_page_feedback
-                WHERE uuid IN (
-                    SELECT uuid FROM (
-                        SELECT uuid,
-                               ROW_NUMBER() OVER (
-                                   PARTITION BY document_uuid, page_number, extraction_job_uuid, user_id 
-                                   ORDER BY created_at DESC
-                               ) as rn
+                SELECT COUNT(*) as total_duplicates
+                FROM (
+                    SELECT document_uuid, page_number, extraction_job_uuid, user_id, COUNT(*) as cnt
+                    FROM document_page_feedback
+                    WHERE deleted_at IS NULL AND user_id IS NOT NULL
+                    GROUP BY document_uuid, page_number, extraction_job_uuid, user_id
+                    HAVING COUNT(*) > 1
+                ) duplicates
+            """)
+            duplicate_count = cursor.fetchone()[0]
+
+            if duplicate_count > 0:
+                print(f"⚠️  Found {duplicate_count} duplicate rating groups")
+                print("🧹 Cleaning up duplicates (keeping most recent rating per user/page/extractor)...")
+
+                # Delete duplicate ratings, keeping only the most recent one. The
+                # latest rating of a group is the last row inserted, i.e. its
+                # MAX(rowid); a temporary index (entries carry the rowid) turns
+                # this into one grouped index scan instead of a sort +
+                # window-function pass.
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS tmp_feedback_dedupe
+                    ON document_page_feedback(document_uuid, page_number, extraction_job_uuid, user_id)
+                    WHERE deleted_at IS NULL AND user_id IS NOT NULL
+                """)
+                cursor.execute("""
+                    DELETE FROM document_page_feedback
+                    WHERE deleted_at IS NULL AND user_id IS NOT NULL
+                    AND rowid NOT IN (
+                        SELECT MAX(rowid)
                         FROM document_page_feedback
                         WHERE deleted_at IS NULL AND user_id IS NOT NULL
-                    ) ranked
-                    WHERE rn > 1
-                )
-            """)
-            print(f"✅ Cleaned up {cursor.rowcount} duplicate rating records")
-        else:
-            print("✅ No duplicate ratings found")
-        
-        # Check if constraint already exists
-        cursor.execute("""
-            SELECT COUNT(*) 
-            FROM sqlite_master 
-            WHERE type='index' 
-            AND name='uq_user_page_extractor_rating'
-        """)
-        constraint_exists = cursor.fetchone()[0] > 0
-        
-        if constraint_exists:
-            print("ℹ️  Rating unique constraint already exists")
-        else:
+                        GROUP BY document_uuid, page_number, extraction_job_uuid, user_id
+                    )
+                """)
+                deleted_count = cursor.rowcount
+                cursor.execute("DROP INDEX IF EXISTS tmp_feedback_dedupe")
+                print(f"✅ Cleaned up {deleted_count} duplicate rating records")
+            else:
+                print("✅ No duplicate ratings found")
+
             # Create the unique constraint (as a partial unique index for SQLite)
-            cursor.execute("""
-                CREATE UNIQUE INDEX uq_user_page_extractor_rating
+            # CREATE raises if it fails, so no separate verification read is needed
+            cursor.execute(f"""
+                CREATE UNIQUE INDEX {RATING_UNIQUE_INDEX}
                 ON document_page_feedback(document_uuid, page_number, extraction_job_uuid, user_id)
                 WHERE deleted_at IS NULL AND user_id IS NOT NULL
             """)
+            analyze_tables.add("document_page_feedback")
             print("✅ Created unique constraint for document_page_feedback ratings")
         
-        # Verify the constraint
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='index' 
-            AND name='uq_user_page_extractor_rating'
-        """)
-        if cursor.fetchone():
-            print("✅ Rating unique constraint verified")
-        else:
-            print("❌ Rating unique constraint verification failed")
-
         conn.commit()
+
+        # Gather planner stats for the new indexes (one scan per table, once)
+        for table in sorted(analyze_tables):
+            cursor.execute(f"ANALYZE {table}")
+        if analyze_tables:
+            conn.commit()
         
     except Exception as e:
         print(f"Error during column addition: {e}")
         conn.rollback()
         raise
     finally:
+        # Restore safe defaults before handing the file back to the app
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA locking_mode=NORMAL")
+        # Close the cursor first: a leftover PRAGMA statement keeps the
+        # connection (and its exclusive lock) alive past conn.close()
+        cursor.close()
         conn.close()
+
+
+async def migrate_sqlite(db_file: str):
+    """Migrate SQLite database"""
+    # First, check if columns already exist using raw SQL
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+
+    # Fast path: the schema version lives in the file header, so an
+    # up-to-date database costs a single integer read
+    cursor.execute("PRAGMA user_version")
+    if cursor.fetchone()[0] >= SCHEMA_VERSION:
+        print(f"Schema already at version {SCHEMA_VERSION}, nothing to migrate")
+        conn.close()
+        return
+
+    # Fresh database: create_all below builds every table with the final
+    # schema, so there is nothing to ALTER, dedupe or index by hand
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='users'")
+    if cursor.fetchone() is None:
+        print("No existing tables found, creating the schema from the models")
+        cursor.close()
+        conn.close()
+    else:
+        _patch_existing_schema(conn, cursor)
     
     # Now use SQLAlchemy to handle user creation and data assignment.
-    # Ensure the async engine/session point to the EXACT same DB file we just migrated.
+    # Ensure the async engine/session point to the EXACT same DB file we just migrated;
+    # reuse the app engine (and its statement cache) when it already does.
     from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
     from . import db as dbmod
-    db_url = f"sqlite+aiosqlite:///{Path(db_file).resolve()}"
-    dbmod.engine_async = create_async_engine(db_url, echo=False)
-    dbmod.AsyncSessionLocal = async_sessionmaker(bind=dbmod.engine_async, expire_on_commit=False, class_=AsyncSession)
+    db_path = Path(db_file).resolve()
+    engine_url = dbmod.engine_async.url
+    same_file = (
+        engine_url.get_backend_name() == "sqlite"
+        and bool(engine_url.database)
+        and Path(engine_url.database).resolve() == db_path
+    )
+    if not same_file:
+        await dbmod.engine_async.dispose()
+        dbmod.engine_async = create_async_engine(f"sqlite+aiosqlite:///{db_path}", echo=False)
+        dbmod.AsyncSessionLocal = async_sessionmaker(bind=dbmod.engine_async, expire_on_commit=False, class_=AsyncSession)
 
     async with dbmod.engine_async.begin() as conn:
-        # Create tables to ensure they're up to date
-        from .models import Base
-        await conn.run_sync(Base.metadata.create_all)
+        # create_all reflects every table before deciding what to emit; skip
+        # it entirely when one sqlite_master read shows nothing is missing
+        from .db import Base
+        result = await conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
+        existing_tables = set(result.scalars())
+        if not existing_tables.issuperset(Base.metadata.tables):
+            await conn.run_sync(Base.metadata.create_all)
     
     # Use the async session for the rest
-    async for db_session in dbmod.get_db():
+    async with dbmod.AsyncSessionLocal() as db_session:
         try:
-            # Ensure an admin user exists matching ADMIN_EMAIL
-            print(f"Using ADMIN_EMAIL from env: {DEFAULT_ADMIN_EMAIL}")
-            result = await db_session.execute(select(User).where(User.email == DEFAULT_ADMIN_EMAIL))
-            admin_user = result.scalar_one_or_none()
-            if admin_user is None:
-                # If no users exist at all, create admin; otherwise also create admin
-                print("Admin user not found, creating from .env...")
-                admin_user = User(
-                    name=DEFAULT_ADMIN_NAME,
-                    email=DEFAULT_ADMIN_EMAIL,
-                    hashed_password=hash_password(DEFAULT_ADMIN_PASSWORD),
-                    is_active=True,
-                    is_approved=True,
-                    role='admin'
-                )
-                db_session.add(admin_user)
-                await db_session.commit()
-                await db_session.refresh(admin_user)
-                print(f"✓ Created admin user with email: {DEFAULT_ADMIN_EMAIL}")
-            else:
-                # Update flags to guarantee access; optionally sync password
-                updated = False
-                if not getattr(admin_user, 'is_active', True):
-                    admin_user.is_active = True
-                    updated = True
-                if not getattr(admin_user, 'is_approved', False):
-                    admin_user.is_approved = True
-                    updated = True
-                if getattr(admin_user, 'role', 'user') != 'admin':
-                    admin_user.role = 'admin'
-                    updated = True
-                # Always reset password to env for deterministic access
-                admin_user.hashed_password = hash_password(DEFAULT_ADMIN_PASSWORD)
-                updated = True
-                if updated:
-                    print("✓ Ensured admin user flags and password are up to date")
-                    await db_session.commit()
-
-            admin_user_id = admin_user.id
-            print(f"Using admin user (id: {admin_user_id}) for orphaned data")
-            
-            # Update projects without user_id
-            result = await db_session.execute(
-                select(Project).where(Project.user_id.is_(None))
-            )
-            orphaned_projects = result.scalars().all()
-            
-            if orphaned_projects:
-                print(f"Found {len(orphaned_projects)} projects without user_id, assigning to user {admin_user_id}")
-                for project in orphaned_projects:
-                    project.user_id = admin_user_id
-                await db_session.commit()
-                print("✓ Updated orphaned projects")
-            else:
-                print("No orphaned projects found")
-            
-            # Update documents without user_id
-            result = await db_session.execute(
-                select(Document).where(Document.user_id.is_(None))
-            )
-            orphaned_documents = result.scalars().all()
-            
-            if orphaned_documents:
-                print(f"Found {len(orphaned_documents)} documents without user_id, assigning to user {admin_user_id}")
-                for document in orphaned_documents:
-                    document.user_id = admin_user_id
-                await db_session.commit()
-                print("✓ Updated orphaned documents")
-            else:
-                print("No orphaned documents found")
-            
-            break  # Exit the async generator
-            
+            # Admin user + orphan backfill share one transaction: SQLite
+            # serialises writes anyway, so extra commits only add fsyncs
+            async with db_session.begin():
+                # Ensure an admin user exists matching ADMIN_EMAIL
+                print(f"Using ADMIN_EMAIL from env: {DEFAULT_ADMIN_EMAIL}")
+                result = await db_session.execute(select(User).where(User.email == DEFAULT_ADMIN_EMAIL))
+                admin_user = result.scalar_one_or_none()
+                if admin_user is None:
+                    # If no users exist at all, create admin; otherwise also create admin
+                    print("Admin user not found, creating from .env...")
+                    # INSERT ... RETURNING hands back the new id in the same round-trip
+                    result = await db_session.execute(
+                        insert(User).returning(User.id),
+                        {
+                            "name": DEFAULT_ADMIN_NAME,
+                            "email": DEFAULT_ADMIN_EMAIL,
+                            "hashed_password": hash_password(DEFAULT_ADMIN_PASSWORD),
+                            "is_active": True,
+                            "is_approved": True,
+                            "role": 'admin',
+                        },
+                    )
+                    admin_user_id = result.scalar_one()
+                    print(f"✓ Created admin user with email: {DEFAULT_ADMIN_EMAIL}")
+                else:
+                    # Update flags to guarantee access; optionally sync password
+                    updated = False
+                    if not getattr(admin_user, 'is_active', True):
+                        admin_user.is_active = True
+                        updated = True
+                    if not getattr(admin_user, 'is_approved', False):
+                        admin_user.is_approved = True
+                        updated = True
+                    if getattr(admin_user, 'role', 'user') != 'admin':
+                        admin_user.role = 'admin'
+                        updated = True
+                    # Hashing is deliberately slow, so only reset the password on request
+                    if FORCE_ADMIN_PASSWORD_RESET:
+                        admin_user.hashed_password = hash_password(DEFAULT_ADMIN_PASSWORD)
+                        updated = True
+                    if updated:
+                        print("✓ Ensured admin user flags and password are up to date")
+                    admin_user_id = admin_user.id
+
+                print(f"Using admin user (id: {admin_user_id}) for orphaned data")
+
+                # Assign orphaned projects and documents with one UPDATE each
+                for table in ("projects", "documents"):
+                    result = await db_session.execute(
+                        text(f"UPDATE {table} SET user_id = :uid WHERE user_id IS NULL"),
+                        {"uid": admin_user_id},
+                    )
+                    if result.rowcount:
+                        print(f"✓ Assigned {result.rowcount} orphaned {table} to user {admin_user_id}")
+                    else:
+                        print(f"No orphaned {table} found")
+
+                # Stamp the schema version last so a failed run is retried next time
+                await db_session.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
         except Exception as e:
+            # session.begin() has already rolled the transaction back
             print(f"Error during data migration: {e}")
-            await db_session.rollback()
             raise
 
+    # Release the pooled aiosqlite connection so the script can exit cleanly
+    await dbmod.engine_async.dispose()
+
+# pg_advisory_xact_lock key serialising concurrent upgrade_postgres_schema runs
+SCHEMA_UPGRADE_LOCK_ID = 7_146_002
+
+async def upgrade_postgres_schema():
+    """Bring an existing Postgres schema in line with the models.
+
+    create_all only creates missing tables, so column changes made on the
+    models since a table was created are applied here:
+    - varchar identifier columns are converted to native uuid, each table
+      rewritten once with all of its columns in a single ALTER TABLE;
+    - server defaults the database column lacks are set.
+    The uuid conversion rewrites each table under an ACCESS EXCLUSIVE lock
+    and fails on any non-UUID value, so this is an explicit migration step
+    (--postgres-schema), never run at API startup. A no-op once current.
+    """
+    from . import db as dbmod
+
+    if dbmod.engine_async.dialect.name != "postgresql":
+        print("❌ Configured database is not PostgreSQL")
+        return False
+
+    try:
+        async with dbmod.engine_async.begin() as conn:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": SCHEMA_UPGRADE_LOCK_ID})
+            result = await conn.execute(text("""
+                SELECT table_name, column_name, data_type, column_default
+                FROM information_schema.columns
+                WHERE table_schema = current_schema()
+            """))
+            not_uuid = set()
+            without_default = set()
+            for table, column, data_type, column_default in result:
+                if data_type != "uuid":
+                    not_uuid.add((table, column))
+                if column_default is None:
+                    without_default.add((table, column))
+
+            for table in Base.metadata.sorted_tables:
+                to_convert = [
+                    column.name for column in table.columns
+                    if isinstance(column.type, Uuid) and (table.name, column.name) in not_uuid
+                ]
+                if to_convert:
+                    clauses = ", ".join(
+                        f"ALTER COLUMN {column} TYPE uuid USING {column}::uuid" for column in to_convert
+                    )
+                    await conn.execute(text(f"ALTER TABLE {table.name} {clauses}"))
+                    print(f"✅ Converted {table.name} to uuid: {', '.join(to_convert)}")
+
+                for column in table.columns:
+                    if column.server_default is None or (table.name, column.name) not in without_default:
+                        continue
+                    default_sql = column.server_default.arg.compile(dialect=conn.dialect)
+                    await conn.execute(text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {column.name} SET DEFAULT {default_sql}"
+                    ))
+                    print(f"✅ Set default {default_sql} on {table.name}.{column.name}")
+        return True
+    finally:
+        await dbmod.engine_async.dispose()
+
+async def create_postgres_indexes():
+    """Create the model's composite indexes on an existing Postgres database.
+
+    CREATE INDEX CONCURRENTLY builds without locking out writes, but cannot
+    run inside a transaction, so the connection is switched to AUTOCOMMIT.
+    """
+    from sqlalchemy.dialects.postgresql import dialect as postgresql_dialect
+    from . import db as dbmod
+
+    if dbmod.engine_async.dialect.name != "postgresql":
+        print("❌ Configured database is not PostgreSQL")
+        return False
+
+    try:
+        async with dbmod.engine_async.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for index in COMPOSITE_INDEXES:
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=postgresql_dialect()))
+                await conn.execute(text(ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)))
+                print(f"✅ Ensured index {index.name}")
+        return True
+    finally:
+        await dbmod.engine_async.dispose()
+
 async def rollback_rating_constraint():
     """Rollback: Remove the rating unique constraint"""
     print("🔄 Rolling back: Removing rating unique constraint")
     
-    # Find the database file
-    here = Path(__file__).resolve()
-    src_db_path = here.with_name("pdf-extraction.db")
-    app_root_db_path = src_db_path.parent.parent / "pdf-extraction.db"
-    
-    candidate_paths = [
-        str(src_db_path),
-        str(app_root_db_path),
-        "/app/src/pdf-extraction.db",
-        "/app/pdf-extraction.db",
-        "backend/src/pdf-extraction.db",
-        "./pdf-extraction.db",
-        "pdf-extraction.db",
-    ]
-    
-    db_file = next((p for p in candidate_paths if os.path.exists(p)), None)
+    db_file = _find_db_file()
     if not db_file:
         print("❌ No database file found")
         return False
@@ -508,7 +564,7 @@ async def rollback_rating_constraint():
     cursor = conn.cursor()
     
     try:
-        cursor.execute("DROP INDEX IF EXISTS uq_user_page_extractor_rating")
+        cursor.execute(f"DROP INDEX IF EXISTS {RATING_UNIQUE_INDEX}")
         conn.commit()
         print("✅ Rating unique constraint rollback completed")
         return True
@@ -525,9 +581,24 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Database migration script')
     parser.add_argument('--rollback-rating-constraint', action='store_true', 
                        help='Rollback the rating unique constraint')
+    parser.add_argument('--postgres-indexes', action='store_true',
+                       help='Create the composite feedback/annotation indexes on PostgreSQL')
+    parser.add_argument('--postgres-schema', action='store_true',
+                       help='Convert identifier columns to uuid and set missing defaults on PostgreSQL (rewrites tables; run once during a maintenance window)')
     args = parser.parse_args()
+
+    # uvloop trims per-await overhead on the many small aiosqlite round-trips
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     
     if args.rollback_rating_constraint:
         asyncio.run(rollback_rating_constraint())
+    elif args.postgres_indexes:
+        asyncio.run(create_postgres_indexes())
+    elif args.postgres_schema:
+        asyncio.run(upgrade_postgres_schema())
     else:
         asyncio.run(run_migration())
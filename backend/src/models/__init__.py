@@ -4,6 +4,8 @@ from .enums import (
     PDFExtractorType,
     ImageExtractorType,
     FeedbackType,
+    is_pdf_extractor,
+    is_image_extractor,
 )
 
 # Database Models
@@ -17,41 +19,63 @@ from .database import (
     Annotation,
 )
 
-# Schemas
-from .schemas import (
+# Schemas are imported lazily (PEP 562): ORM-only processes such as the
+# Celery worker never pay for building their pydantic core schemas
+_SCHEMA_NAMES = frozenset({
     # Auth schemas
-    Token,
-    UserCreate,
-    UserLogin,
-    PasswordChange,
+    "Token",
+    "UserCreate",
+    "UserLogin",
+    "PasswordChange",
     # Document schemas
-    DocumentResponse,
-    UploadResponse,
-    MultipleUploadResponse,
-    PaginatedDocumentsResponse,
-    PaginationMeta,
+    "DocumentResponse",
+    "UploadResponse",
+    "MultipleUploadResponse",
+    "PaginatedDocumentsResponse",
+    "PaginationMeta",
     # Project schemas
-    ProjectResponse,
-    ProjectCreateRequest,
+    "ProjectResponse",
+    "ProjectCreateRequest",
     # Extraction schemas
-    DocumentExtractionJobResponse,
-    DocumentPageContentResponse,
-    DocumentPageFeedbackRequest,
-    DocumentPageFeedbackResponse,
-    ExtractorInfo,
-    ExtractorCategory,
-    ExtractorsResponse,
-    UploadWithExtractorsRequest,
+    "DocumentExtractionJobResponse",
+    "DocumentPageContentResponse",
+    "DocumentPageFeedbackRequest",
+    "DocumentPageFeedbackResponse",
+    "ExtractorInfo",
+    "ExtractorCategory",
+    "ExtractorsResponse",
+    "UploadWithExtractorsRequest",
     # Annotation schemas
-    AnnotationCreateRequest,
-    AnnotationResponse,
-)
+    "AnnotationCreateRequest",
+    "AnnotationResponse",
+    "AnnotationListItem",
+    # Rating schemas
+    "UserRatingBreakdown",
+    # Identifier type
+    "UUIDStr",
+    # List adapters
+    "DOCUMENT_LIST_ADAPTER",
+    "JOB_LIST_ADAPTER",
+    "ANNOTATION_LIST_ADAPTER",
+    "ANNOTATION_ITEM_LIST_ADAPTER",
+    "RATING_BREAKDOWN_LIST_ADAPTER",
+})
+
+
+def __getattr__(name):
+    if name in _SCHEMA_NAMES:
+        from . import schemas
+        return getattr(schemas, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # Enums
     "ExtractionStatus",
     "PDFExtractorType", 
     "ImageExtractorType",
+    "is_pdf_extractor",
+    "is_image_extractor",
     "FeedbackType",
     # Database Models
     "User",
@@ -87,4 +111,15 @@ __all__ = [
     # Annotation schemas
     "AnnotationCreateRequest",
     "AnnotationResponse",
+    "AnnotationListItem",
+    # Rating schemas
+    "UserRatingBreakdown",
+    # Identifier type
+    "UUIDStr",
+    # List adapters
+    "DOCUMENT_LIST_ADAPTER",
+    "JOB_LIST_ADAPTER",
+    "ANNOTATION_LIST_ADAPTER",
+    "ANNOTATION_ITEM_LIST_ADAPTER",
+    "RATING_BREAKDOWN_LIST_ADAPTER",
 ]
@@ -1,7 +1,26 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, Float, Boolean, ForeignKey
+from sqlalchemy import Column, String, Uuid, Integer, DateTime, Text, JSON, Float, Boolean, ForeignKey, UniqueConstraint, Index, insert, select, func, case, bindparam
+from sqlalchemy import text as sql_text  # Annotation.text shadows the plain name
 from datetime import datetime, timezone
-from ..db import Base
-from .enums import ExtractionStatus
+import csv
+import io
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import relationship
+from ..db import Base, json_serializer
+
+def utc_now():
+    """Client-side default for creation timestamps.
+
+    Kept alongside server_default=func.now(): tables created before that
+    server default have no column default, so the ORM still stamps the value.
+    """
+    return datetime.now(timezone.utc)
+
+# Identifier columns: native 16-byte UUID on Postgres, unchanged string storage
+# on SQLite (existing rows hold dashed hex). Python values stay plain str.
+# Existing Postgres databases are converted once with
+# `python -m src.migration --postgres-schema`.
+UUID_TYPE = Uuid(as_uuid=False).with_variant(String(), "sqlite")
 
 class User(Base):
     __tablename__ = "users"
@@ -22,83 +41,238 @@ class User(Base):
 class Project(Base):
     __tablename__ = "projects"
 
-    uuid = Column(String, primary_key=True, index=True)
+    uuid = Column(UUID_TYPE, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    owner_name = Column(String, nullable=True)
     file_upload_type = Column(String, nullable=True)  # 'pdf' or 'image'
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Soft delete timestamp
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete timestamp
+
+    # Owner's name is read through users.name rather than copied onto the row;
+    # list queries batch-load it with selectinload(...).load_only(User.id, User.name)
+    owner = relationship("User", lazy="raise")
+    owner_name = association_proxy("owner", "name")
+
+    __table_args__ = (
+        # Project listing is ordered by creation time over live rows only
+        Index(
+            "ix_projects_active",
+            "created_at",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+            sqlite_where=sql_text("deleted_at IS NULL"),
+        ),
+    )
 
 class Document(Base):
     __tablename__ = "documents"
     
-    uuid = Column(String, primary_key=True, index=True)
+    uuid = Column(UUID_TYPE, primary_key=True, index=True)
     filename = Column(String, nullable=False)
     filepath = Column(String, nullable=False)
-    uploaded_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    uploaded_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False)
     page_count = Column(Integer, nullable=True)
     file_type = Column(String, nullable=False)  # 'pdf' or 'image'
-    project_uuid = Column(String, nullable=True, index=True)
+    project_uuid = Column(UUID_TYPE, nullable=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    owner_name = Column(String, nullable=True)
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Soft delete timestamp
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete timestamp
+
+    # Read through users.name, as on Project
+    owner = relationship("User", lazy="raise")
+    owner_name = association_proxy("owner", "name")
+
+    __table_args__ = (
+        # Paginated project document listing over live rows only
+        Index(
+            "ix_documents_active",
+            "project_uuid",
+            "uploaded_at",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+            sqlite_where=sql_text("deleted_at IS NULL"),
+        ),
+    )
 
 class DocumentExtractionJob(Base):
     __tablename__ = "document_extraction_jobs"
     
-    uuid = Column(String, primary_key=True, index=True)
-    document_uuid = Column(String, nullable=False, index=True)
+    uuid = Column(UUID_TYPE, primary_key=True, index=True)
+    document_uuid = Column(UUID_TYPE, nullable=False, index=True)
     extractor = Column(String, nullable=False)
-    status = Column(String, nullable=False, default=ExtractionStatus.NOT_STARTED)
+    status = Column(String, nullable=False, default="Not Started")  # ExtractionStatus.NOT_STARTED
     start_time = Column(DateTime(timezone=True), nullable=True)
     end_time = Column(DateTime(timezone=True), nullable=True)
     latency_ms = Column(Integer, nullable=True)  # latency in milliseconds
     cost = Column(Float, nullable=True)  # total cost
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Soft delete timestamp
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete timestamp
+
+    __table_args__ = (
+        # Live jobs of a document
+        Index(
+            "ix_extraction_jobs_document_active",
+            "document_uuid",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+            sqlite_where=sql_text("deleted_at IS NULL"),
+        ),
+    )
+
+    @classmethod
+    async def aggregate_feedback(cls, session, job_uuids, user_id=None):
+        """Feedback statistics for many jobs in one grouped query.
+
+        Returns {job_uuid: (pages_annotated, average_rating, feedback_count)};
+        jobs without feedback are absent from the dict.
+        """
+        if not job_uuids:
+            return {}
+        query = (
+            select(
+                DocumentPageFeedback.extraction_job_uuid,
+                func.count(func.distinct(case(
+                    (DocumentPageFeedback.rating.is_not(None), DocumentPageFeedback.page_number)
+                ))),
+                func.avg(DocumentPageFeedback.rating),
+                func.count(),
+            )
+            .where(
+                DocumentPageFeedback.extraction_job_uuid.in_(bindparam("uuids", expanding=True)),
+                DocumentPageFeedback.deleted_at.is_(None),
+            )
+            .group_by(DocumentPageFeedback.extraction_job_uuid)
+        )
+        if user_id is not None:
+            query = query.where(DocumentPageFeedback.user_id == user_id)
+        result = await session.execute(query, {"uuids": list(job_uuids)})
+        return {
+            job_uuid: (pages, float(avg) if avg is not None else None, count)
+            for job_uuid, pages, avg, count in result
+        }
 
 class DocumentPageContent(Base):
     __tablename__ = "document_page_content"
     
-    uuid = Column(String, primary_key=True, index=True)
-    extraction_job_uuid = Column(String, nullable=False, index=True)
+    uuid = Column(UUID_TYPE, primary_key=True, index=True)
+    extraction_job_uuid = Column(UUID_TYPE, nullable=False, index=True)
     page_number = Column(Integer, nullable=False)
-    content = Column(JSON, nullable=False)
-    metadata_ = Column(JSON, default=dict)
+    # JSONB on Postgres (stored parsed, no re-parse per read), JSON elsewhere
+    content = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    metadata_ = Column(JSON().with_variant(JSONB(), "postgresql"), default=dict)
     deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Soft delete timestamp
-    
-    __table_args__ = (
-        {'extend_existing': True},
+
+    # Live feedback for this job/page; load with selectinload() to fetch the
+    # feedback for a whole list of pages in one IN query
+    feedbacks = relationship(
+        "DocumentPageFeedback",
+        primaryjoin=(
+            "and_(DocumentPageContent.extraction_job_uuid == foreign(DocumentPageFeedback.extraction_job_uuid), "
+            "DocumentPageContent.page_number == foreign(DocumentPageFeedback.page_number), "
+            "DocumentPageFeedback.deleted_at.is_(None))"
+        ),
+        # Oldest first, so feedbacks[-1] is the latest
+        order_by="DocumentPageFeedback.created_at",
+        viewonly=True,
+        lazy="raise",
     )
 
+    # Above this many rows a Postgres COPY beats a multi-row INSERT
+    COPY_THRESHOLD = 100
+
+    @classmethod
+    def bulk_insert(cls, session, rows):
+        """Insert page rows (dicts keyed by column name) in one round-trip.
+
+        Uses COPY ... FROM STDIN on Postgres for large batches, otherwise a
+        single executemany INSERT; both run in the session's transaction.
+        """
+        if not rows:
+            return
+        columns = ("uuid", "extraction_job_uuid", "page_number", "content", "metadata_")
+        if len(rows) > cls.COPY_THRESHOLD and session.get_bind().dialect.name == "postgresql":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for row in rows:
+                writer.writerow((
+                    row["uuid"],
+                    row["extraction_job_uuid"],
+                    row["page_number"],
+                    json_serializer(row["content"]),
+                    json_serializer(row.get("metadata_") or {}),
+                ))
+            buf.seek(0)
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {cls.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV)",
+                    buf,
+                )
+            finally:
+                cursor.close()
+        else:
+            session.execute(insert(cls), [{"metadata_": {}, **row} for row in rows])
+
 class DocumentPageFeedback(Base):
     __tablename__ = "document_page_feedback"
     
-    uuid = Column(String, primary_key=True, index=True)
-    document_uuid = Column(String, nullable=False, index=True)
-    page_number = Column(Integer, nullable=False, index=True)
-    extraction_job_uuid = Column(String, nullable=False, index=True)
+    uuid = Column(UUID_TYPE, primary_key=True, index=True)
+    document_uuid = Column(UUID_TYPE, nullable=False, index=True)
+    page_number = Column(Integer, nullable=False)
+    extraction_job_uuid = Column(UUID_TYPE, nullable=False, index=True)
     feedback_type = Column(String, nullable=False, default="single")
     rating = Column(Integer, nullable=True)  # 1-5 rating
     comment = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Soft delete timestamp
+
+    # Author's name is read through users.name rather than copied onto the row
+    user = relationship("User", lazy="raise")
+    user_name = association_proxy("user", "name")
     
     __table_args__ = (
-        {'extend_existing': True},
+        UniqueConstraint(
+            'document_uuid', 
+            'page_number', 
+            'extraction_job_uuid', 
+            'user_id',
+            name='uq_user_page_extractor_rating'
+        ),
+        # Matches the (document, job, page) lookups on live rows
+        Index(
+            "ix_feedback_doc_job_page_active",
+            "document_uuid",
+            "extraction_job_uuid",
+            "page_number",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+            sqlite_where=sql_text("deleted_at IS NULL"),
+        ),
     )
 
 class Annotation(Base):
     __tablename__ = "annotations"
 
-    uuid = Column(String, primary_key=True, index=True)
-    document_uuid = Column(String, index=True, nullable=False)
-    extraction_job_uuid = Column(String, index=True, nullable=False)
-    page_number = Column(Integer, index=True, nullable=False)
+    uuid = Column(UUID_TYPE, primary_key=True, index=True)
+    document_uuid = Column(UUID_TYPE, index=True, nullable=False)
+    extraction_job_uuid = Column(UUID_TYPE, index=True, nullable=False)
+    page_number = Column(Integer, nullable=False)
     text = Column(Text, nullable=False)
     comment = Column(Text, nullable=False)
     selection_start = Column(Integer, nullable=False)
     selection_end = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Soft delete timestamp
+
+    # Author's name is read through users.name rather than copied onto the row
+    user = relationship("User", lazy="raise")
+    user_name = association_proxy("user", "name")
+
+    __table_args__ = (
+        # Matches the (document, job, page) lookups on live rows
+        Index(
+            "ix_annotations_doc_job_page_active",
+            "document_uuid",
+            "extraction_job_uuid",
+            "page_number",
+            postgresql_where=sql_text("deleted_at IS NULL"),
+            sqlite_where=sql_text("deleted_at IS NULL"),
+        ),
+    )
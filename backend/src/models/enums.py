@@ -1,12 +1,14 @@
-from enum import Enum
+from enum import StrEnum
 
-class ExtractionStatus(str, Enum):
+class ExtractionStatus(StrEnum):
     NOT_STARTED = "Not Started"
     PROCESSING = "Processing"
     SUCCESS = "Success"
     FAILURE = "Failure"
 
-class PDFExtractorType(str, Enum):
+ExtractionStatus.VALUES = frozenset(ExtractionStatus)
+
+class PDFExtractorType(StrEnum):
     PYPDF2 = "PyPDF2"
     PYMUPDF = "PyMuPDF"
     PDFPLUMBER = "PDFPlumber"
@@ -22,7 +24,9 @@ class PDFExtractorType(str, Enum):
     MARKITDOWN = "MarkItDown"
     LLAMAPARSE = "LlamaParse"
 
-class ImageExtractorType(str, Enum):
+PDFExtractorType.VALUES = frozenset(PDFExtractorType)
+
+class ImageExtractorType(StrEnum):
     TESSERACT = "Tesseract"
     TEXTRACT = "Textract"
     MATHPIX = "Mathpix"
@@ -30,6 +34,18 @@ class ImageExtractorType(str, Enum):
     OPENAI_GPT4O = "gpt-4o"
     OPENAI_GPT4_TURBO = "gpt-4-turbo"
 
-class FeedbackType(str, Enum):
+ImageExtractorType.VALUES = frozenset(ImageExtractorType)
+
+class FeedbackType(StrEnum):
     SINGLE = "Single"
     COMPARISON = "Comparison"
+
+FeedbackType.VALUES = frozenset(FeedbackType)
+
+# Membership checks hash into the precomputed VALUES set instead of walking
+# the enum members; StrEnum members hash and compare equal to their values
+def is_pdf_extractor(name: str) -> bool:
+    return name in PDFExtractorType.VALUES
+
+def is_image_extractor(name: str) -> bool:
+    return name in ImageExtractorType.VALUES
@@ -1,6 +1,20 @@
-from pydantic import BaseModel
-from typing import Optional, List
-from .enums import ExtractionStatus
+from dataclasses import dataclass, field
+from pydantic import AfterValidator, BaseModel, ConfigDict, TypeAdapter
+from typing import Annotated, Literal, Optional, List
+from uuid import UUID
+
+# Shared by the response models built from ORM rows in list endpoints:
+# attribute access instead of dict coercion, and no extra-field checks
+ORM_RESPONSE_CONFIG = ConfigDict(from_attributes=True, extra='ignore')
+
+# Internal aggregates assembled in Python from trusted rows are plain slotted
+# dataclasses: no validation on construction, pydantic still serializes them
+internal_schema = dataclass(slots=True, frozen=True, kw_only=True)
+
+# Identifier path/query parameters and request body fields: rejected with a 422
+# unless they parse as UUIDs (the columns are native uuid on Postgres), then
+# passed on as canonical strings
+UUIDStr = Annotated[str, AfterValidator(lambda value: str(UUID(value)))]
 
 # Authentication Schemas
 class Token(BaseModel):
@@ -22,6 +36,8 @@ class PasswordChange(BaseModel):
 
 # Document Schemas
 class DocumentResponse(BaseModel):
+    model_config = ORM_RESPONSE_CONFIG
+
     uuid: str
     filename: str
     filepath: str
@@ -39,7 +55,8 @@ class MultipleUploadResponse(BaseModel):
     document_uuids: List[str]
     failed_uploads: List[dict] = []
 
-class PaginationMeta(BaseModel):
+@internal_schema
+class PaginationMeta:
     page: int
     page_size: int
     total_count: int
@@ -68,10 +85,13 @@ class ProjectCreateRequest(BaseModel):
 
 # Extraction Schemas
 class DocumentExtractionJobResponse(BaseModel):
+    model_config = ORM_RESPONSE_CONFIG
+
     uuid: str
     document_uuid: str
     extractor: str
-    status: ExtractionStatus
+    # Literal (the ExtractionStatus values) validates faster than an enum field
+    status: Literal["Not Started", "Processing", "Success", "Failure"]
     start_time: Optional[str] = None
     end_time: Optional[str] = None
     latency_ms: Optional[int] = None
@@ -81,6 +101,8 @@ class DocumentExtractionJobResponse(BaseModel):
     total_feedback_count: int = 0  # Total number of feedback entries
 
 class DocumentPageFeedbackResponse(BaseModel):
+    model_config = ORM_RESPONSE_CONFIG
+
     uuid: str
     document_uuid: str
     page_number: int
@@ -88,6 +110,8 @@ class DocumentPageFeedbackResponse(BaseModel):
     feedback_type: str
     rating: Optional[int] = None
     comment: Optional[str] = None
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
     created_at: str
 
 class DocumentPageContentResponse(BaseModel):
@@ -98,19 +122,20 @@ class DocumentPageContentResponse(BaseModel):
     feedback: Optional[DocumentPageFeedbackResponse] = None
 
 class DocumentPageFeedbackRequest(BaseModel):
-    document_uuid: str
+    document_uuid: UUIDStr
     page_number: int
-    extraction_job_uuid: str
+    extraction_job_uuid: UUIDStr
     rating: Optional[int] = None  # 1-5 rating
     comment: Optional[str] = None
 
 # Extractor Schemas
-class ExtractorInfo(BaseModel):
+@internal_schema
+class ExtractorInfo:
     id: str
     name: str
     description: str
     cost_per_page: float
-    support_tags: List[str] = []
+    support_tags: List[str] = field(default_factory=list)
 
 class ExtractorCategory(BaseModel):
     category: str
@@ -126,8 +151,8 @@ class UploadWithExtractorsRequest(BaseModel):
 # Annotation Schemas
 class AnnotationCreateRequest(BaseModel):
     # Match frontend payload keys
-    documentId: str
-    extractionJobUuid: str
+    documentId: UUIDStr
+    extractionJobUuid: UUIDStr
     pageNumber: int
     text: str
     comment: str | None = None
@@ -135,12 +160,47 @@ class AnnotationCreateRequest(BaseModel):
     selectionEnd: int
 
 class AnnotationResponse(BaseModel):
+    model_config = ORM_RESPONSE_CONFIG
+
     uuid: str
     document_uuid: str
-    extraction_job_uuid: str
+    extraction_job_uuid: Optional[str] = None
     page_number: int
     text: str
     comment: str
     selection_start: int
     selection_end: int
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
     created_at: str
+
+@internal_schema
+class AnnotationListItem:
+    uuid: str
+    page_number: int
+    extractor: str
+    extraction_job_uuid: str
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
+    text: str
+    comment: str
+    created_at: str
+
+# Rating Schemas
+@internal_schema
+class UserRatingBreakdown:
+    user_id: Optional[int] = None
+    user_name: Optional[str] = None
+    average_rating: float
+    pages_rated: int
+    total_ratings: int
+    latest_comment: Optional[str] = None
+    latest_rated_at: str
+
+# List adapters, built once at import so list endpoints can serialize
+# without FastAPI re-wrapping a List[...] response model on every request
+DOCUMENT_LIST_ADAPTER = TypeAdapter(List[DocumentResponse])
+JOB_LIST_ADAPTER = TypeAdapter(List[DocumentExtractionJobResponse])
+ANNOTATION_LIST_ADAPTER = TypeAdapter(List[AnnotationResponse])
+ANNOTATION_ITEM_LIST_ADAPTER = TypeAdapter(List[AnnotationListItem])
+RATING_BREAKDOWN_LIST_ADAPTER = TypeAdapter(List[UserRatingBreakdown])
@@ -1,8 +1,10 @@
+import functools
 import os
 import time
 import uuid
-from celery import Celery
-from sqlalchemy import create_engine, update
+from celery import Celery, group
+from celery.signals import worker_process_init
+from sqlalchemy import bindparam, create_engine, func, select, update
 from sqlalchemy.orm import sessionmaker
 from loguru import logger
 from contextlib import contextmanager
@@ -14,6 +16,13 @@ from src.constants import (
     REDIS_BACKEND_URL,
     DATABASE_URL,
     CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_TIMEOUT,
+    CPU_BOUND_EXTRACTORS,
+    CPU_EXTRACTION_QUEUE,
+    ASYNC_JOB_POLL_INITIAL_SECONDS,
+    ASYNC_JOB_POLL_MAX_SECONDS,
+    ASYNC_JOB_MAX_WAIT_SECONDS,
+    VISIBILITY_TIMEOUT_MARGIN_SECONDS,
 )
 from src.file_coordinator import (
     download_to_shared_volume,
@@ -23,19 +32,57 @@ from src.file_coordinator import (
 )
 from sqlalchemy.exc import DatabaseError, OperationalError, PendingRollbackError
 from psycopg2 import DatabaseError as Psycopg2DatabaseError
-from src.factory import get_reader
+from src.factory import get_task_reader
+from src.db import json_serializer, json_deserializer
 from src.models.database import Document, DocumentExtractionJob, DocumentPageContent
 from src.models.enums import ExtractionStatus
 
+# Under the gevent pool (-P gevent monkey-patches the stdlib before this module
+# loads) psycopg2 must also yield to the hub while waiting on the server
+try:
+    from gevent import monkey
+    from psycogreen.gevent import patch_psycopg
+except ImportError:
+    pass
+else:
+    if monkey.is_module_patched("socket"):
+        patch_psycopg()
+
+
+def route_extraction_task(name, args, kwargs, options, task=None, **kw):
+    """Send CPU-bound extractors to the prefork queue; the rest keep the default."""
+    extractor_type = kwargs.get("extractor_type") or (args[3] if len(args) > 3 else None)
+    if extractor_type in CPU_BOUND_EXTRACTORS:
+        return {"queue": CPU_EXTRACTION_QUEUE}
+    return None
+
+
 # Configure Celery
 celery_app = Celery("pdf_extraction")
 celery_app.config_from_object(
     {
         "broker_url": REDIS_BROKER_URL,
         "result_backend": REDIS_BACKEND_URL,
-        "task_serializer": "json",
-        "accept_content": ["json"],
-        "result_serializer": "json",
+        # Task args are a few short strings; msgpack is cheaper to encode and
+        # decode than JSON. JSON stays accepted for messages queued before the switch
+        "task_serializer": "msgpack",
+        "accept_content": ["msgpack", "json"],
+        "result_serializer": "msgpack",
+        # Callers only track progress through the job rows, never .get() a result
+        "task_ignore_result": True,
+        "result_expires": 3600,
+        "task_routes": (route_extraction_task,),
+        # Extractions are long: reserve one message per worker slot so a busy
+        # process doesn't sit on tasks an idle one could take. Tasks are acked
+        # early (acks_late stays off), so the visibility timeout only has to
+        # outlast reserved-but-unstarted messages; it follows the longest
+        # async wait so a slower task never gets redelivered
+        "worker_prefetch_multiplier": 1,
+        "broker_transport_options": {
+            "visibility_timeout": ASYNC_JOB_MAX_WAIT_SECONDS + VISIBILITY_TIMEOUT_MARGIN_SECONDS,
+            "socket_keepalive": True,
+            "priority_steps": [0, 3, 6, 9],
+        },
         "timezone": "UTC",
         "enable_utc": True,
     }
@@ -50,10 +97,69 @@ engine = create_engine(
     pool_recycle=3600,
     pool_timeout=30,
     echo=False,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@worker_process_init.connect
+def _init_worker_process(**_):
+    """Give each forked prefork child its own connection pool.
+
+    Connections inherited from the parent process must not be used (or
+    closed) by the child; close=False just drops them from this pool.
+    """
+    engine.dispose(close=False)
+
+# Job status statements, built once and executed with per-task parameters
+# (SET values are taken from the column-named parameter keys; the b_ prefix
+# keeps the WHERE binds apart from them). Identical statement objects
+# hit SQLAlchemy's compiled cache without rebuilding the construct each call;
+# the task session holds no job objects, so there is nothing to synchronize.
+_START_JOB = (
+    update(DocumentExtractionJob)
+    .where(
+        DocumentExtractionJob.uuid == bindparam("b_job_uuid"),
+        DocumentExtractionJob.deleted_at.is_(None),
+        DocumentExtractionJob.document_uuid == Document.uuid,
+        Document.uuid == bindparam("b_document_uuid"),
+        Document.deleted_at.is_(None),
+    )
+    .returning(Document.filename)
+    .execution_options(synchronize_session=False)
+)
+# Fast readers' existence check: the document's filename, only while both the
+# job and its document are live
+_DOCUMENT_FILENAME = (
+    select(Document.filename)
+    .join(DocumentExtractionJob, DocumentExtractionJob.document_uuid == Document.uuid)
+    .where(
+        DocumentExtractionJob.uuid == bindparam("b_job_uuid"),
+        DocumentExtractionJob.deleted_at.is_(None),
+        Document.uuid == bindparam("b_document_uuid"),
+        Document.deleted_at.is_(None),
+    )
+)
+# Fast readers never run _START_JOB, so the final write also stamps
+# start_time, keeping the first attempt's value across retries, and returns
+# the job's uuid so a deleted job is noticed
+_FINISH_JOB = (
+    update(DocumentExtractionJob)
+    .where(
+        DocumentExtractionJob.uuid == bindparam("b_job_uuid"),
+        DocumentExtractionJob.deleted_at.is_(None),
+    )
+    .values(start_time=func.coalesce(DocumentExtractionJob.start_time, bindparam("b_start_time")))
+    .returning(DocumentExtractionJob.uuid)
+    .execution_options(synchronize_session=False)
+)
+
+# Streamed pages are flushed in batches of this size; kept above
+# DocumentPageContent.COPY_THRESHOLD so full batches still go through COPY
+PAGE_INSERT_BATCH_SIZE = 500
+
+
 def get_db_session():
     """Get database session for Celery tasks"""
     return SessionLocal()
@@ -82,26 +188,29 @@ def get_db_session_context():
         # DO NOT dispose engine here - it's shared across all tasks
 
 
+# Cost per page in integer micro-dollars (example rates); integer products
+# divided once need no rounding
+_COST_PER_PAGE_MICROS = {
+    # PDF extractors
+    "PyPDF": 0,
+    "PyMuPDF": 0,
+    "PDFPlumber": 0,
+    "Camelot": 0,
+    # Image extractors
+    "Textract": 1500,  # AWS Textract pricing
+    "Tesseract": 0,  # Free OCR
+    # OpenAI Vision models
+    "gpt-4o-mini": 5000,  # OpenAI GPT-4o-mini pricing
+    "gpt-4o": 10000,  # OpenAI GPT-4o pricing
+    "gpt-4-turbo": 15000,  # OpenAI GPT-4-turbo pricing
+}
+_DEFAULT_COST_PER_PAGE_MICROS = 1000
+
+
 def calculate_extraction_cost(extractor_type: str, page_count: int) -> float:
     """Calculate cost based on extractor type and page count"""
-    # Cost per page for different extractors (example rates)
-    cost_per_page = {
-        # PDF extractors
-        "PyPDF": 0.0,
-        "PyMuPDF": 0.0,
-        "PDFPlumber": 0.0,
-        "Camelot": 0.0,
-        # Image extractors
-        "Textract": 0.0015,  # AWS Textract pricing
-        "Tesseract": 0.0,  # Free OCR
-        # OpenAI Vision models
-        "gpt-4o-mini": 0.005,  # OpenAI GPT-4o-mini pricing
-        "gpt-4o": 0.010,  # OpenAI GPT-4o pricing
-        "gpt-4-turbo": 0.015,  # OpenAI GPT-4-turbo pricing
-    }
-
-    base_cost = cost_per_page.get(extractor_type, 0.001)
-    return round(base_cost * page_count, 4)
+    base_cost = _COST_PER_PAGE_MICROS.get(extractor_type, _DEFAULT_COST_PER_PAGE_MICROS)
+    return base_cost * page_count / 1_000_000
 
 
 def get_retry_config(extractor_type: str) -> dict:
@@ -109,46 +218,147 @@ def get_retry_config(extractor_type: str) -> dict:
     return EXTRACTOR_RETRY_CONFIG.get(extractor_type, DEFAULT_RETRY_CONFIG)
 
 
+# Errors from the database, network or filesystem: retrying the task won't help
+_INFRA_ERRORS = (
+    DatabaseError,
+    OperationalError,
+    PendingRollbackError,
+    Psycopg2DatabaseError,
+    ConnectionError,
+    FileNotFoundError,
+    OSError,
+)
+
+
 def is_infrastructure_error(exception: Exception) -> bool:
     """Determine if error is infrastructure-related (don't retry)"""
-    infrastructure_errors = (
-        DatabaseError,
-        OperationalError,
-        PendingRollbackError,  # Add this
-        Psycopg2DatabaseError,
-        ConnectionError,
-        FileNotFoundError,
-        OSError,
-    )
-    return isinstance(exception, infrastructure_errors)
+    return isinstance(exception, _INFRA_ERRORS)
+
+
+# INCR + EXPIRE in one atomic round-trip; returns 1 once the threshold is reached
+_CIRCUIT_BREAKER_INCR = redis_client.register_script(
+    "local n = redis.call('INCR', KEYS[1]) "
+    "redis.call('EXPIRE', KEYS[1], ARGV[1]) "
+    "if n >= tonumber(ARGV[2]) then return 1 else return 0 end"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _circuit_key(extractor_type: str) -> str:
+    return f"circuit_breaker:{extractor_type}"
 
 
 def check_circuit_breaker(extractor_type: str) -> bool:
     """Check if circuit breaker is open for this extractor"""
-    circuit_key = f"circuit_breaker:{extractor_type}"
-    failure_count = redis_client.get(circuit_key)
+    failure_count = redis_client.get(_circuit_key(extractor_type))
     if failure_count and int(failure_count) >= CIRCUIT_BREAKER_THRESHOLD:
         logger.warning(f"Circuit breaker OPEN for {extractor_type} - too many failures")
         return True
     return False
 
 
-def record_extractor_failure(extractor_type: str):
-    """Record failure for circuit breaker tracking"""
-    from .file_coordinator import redis_client
-    from .constants import CIRCUIT_BREAKER_TIMEOUT
+def record_extractor_failure(extractor_type: str, pipe):
+    """Queue the circuit breaker's failure count on ``pipe``.
+
+    INCR and EXPIRE run atomically in the Lua script when the caller executes
+    the pipeline; its result at this command's position is 1 once the
+    threshold is reached.
+    """
+    _CIRCUIT_BREAKER_INCR(
+        keys=[_circuit_key(extractor_type)],
+        args=[CIRCUIT_BREAKER_TIMEOUT, CIRCUIT_BREAKER_THRESHOLD],
+        client=pipe,
+    )
+
+
+def reset_circuit_breaker(extractor_type: str, pipe=None):
+    """Reset circuit breaker on success (queued on ``pipe`` when given)"""
+    (pipe if pipe is not None else redis_client).delete(_circuit_key(extractor_type))
 
-    circuit_key = f"circuit_breaker:{extractor_type}"
-    redis_client.incr(circuit_key)
-    redis_client.expire(circuit_key, CIRCUIT_BREAKER_TIMEOUT)
 
+def _prefetch_file(path: str) -> None:
+    """Hint the kernel to read a staged file ahead before a reader opens it.
 
-def reset_circuit_breaker(extractor_type: str):
-    """Reset circuit breaker on success"""
-    from .file_coordinator import redis_client
+    Readers take a path and do their own I/O, so the bytes can't be handed
+    over directly; POSIX_FADV_SEQUENTIAL + WILLNEED starts readahead of the
+    whole file into the page cache instead. No-op where posix_fadvise is
+    unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError as e:
+        logger.debug(f"posix_fadvise failed for {path}: {e}")
+    finally:
+        os.close(fd)
 
-    circuit_key = f"circuit_breaker:{extractor_type}"
-    redis_client.delete(circuit_key)
+
+def _page_has_text(content) -> bool:
+    """True if a page's content holds non-blank text; extractors that return
+    something other than a string for the text keys count as no text"""
+    if not isinstance(content, dict):
+        return False
+    text = content.get("COMBINED") or content.get("TEXT") or content.get("LATEX")
+    return isinstance(text, str) and bool(text.strip())
+
+
+def _store_pages(db, job_uuid: str, pages) -> tuple[int, bool, dict | None]:
+    """Insert (page_number, page) pairs for a job in PAGE_INSERT_BATCH_SIZE batches.
+
+    Returns the page count, whether any page had non-blank text and the first
+    page's content (for logging). Rows go into the caller's transaction, so
+    rejecting the result still rolls them back.
+    """
+    batch = []
+    page_count = 0
+    has_content = False
+    first_content = None
+    for page_num, body in pages:
+        data = (body or {}).get("content") or {}
+        if not has_content:
+            has_content = _page_has_text(data)
+        batch.append(
+            {
+                "uuid": str(uuid.uuid4()),
+                "extraction_job_uuid": job_uuid,
+                "page_number": page_num,
+                "content": data,
+            }
+        )
+        if not page_count:
+            first_content = data
+        page_count += 1
+        if len(batch) >= PAGE_INSERT_BATCH_SIZE:
+            DocumentPageContent.bulk_insert(db, batch)
+            batch = []
+    DocumentPageContent.bulk_insert(db, batch)
+    return page_count, has_content, first_content
+
+
+def _wait_for_job(reader, job_id: str, max_wait: int = ASYNC_JOB_MAX_WAIT_SECONDS) -> str:
+    """Poll an async reader job until it finishes and return its final status.
+
+    Status checks back off exponentially from ASYNC_JOB_POLL_INITIAL_SECONDS
+    up to ASYNC_JOB_POLL_MAX_SECONDS; jobs still running after max_wait abort.
+    """
+    deadline = time.monotonic() + max_wait
+    backoff = ASYNC_JOB_POLL_INITIAL_SECONDS
+    status = reader.get_status(job_id)
+    while status not in ["succeeded", "failed"]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RuntimeError(f"Extraction job {job_id} did not finish within {max_wait}s")
+        logger.info(f"Job {job_id} status: {status}, waiting {backoff}s...")
+        time.sleep(min(backoff, remaining))
+        status = reader.get_status(job_id)
+        backoff = min(backoff * 2, ASYNC_JOB_POLL_MAX_SECONDS)
+    return status
 
 
 @celery_app.task(bind=True)
@@ -159,6 +369,9 @@ def process_document_with_extractor(
     Process a document with the specified extractor (sync or async).
     """
     start_time = datetime.now(timezone.utc)
+    # Latency comes from the monotonic clock, immune to wall-clock (NTP) jumps;
+    # the datetimes are only the stored start/end timestamps
+    start_ns = time.monotonic_ns()
     temp_file_path = None
     with get_db_session_context() as db:
         try:
@@ -168,26 +381,45 @@ def process_document_with_extractor(
                     f"Circuit breaker is OPEN for {extractor_type}. "
                     f"Too many recent failures. Try again later."
                 )
-            # Update job status to Processing
-            db.execute(
-                update(DocumentExtractionJob)
-                .where(DocumentExtractionJob.uuid == job_uuid)
-                .values(status=ExtractionStatus.PROCESSING, start_time=start_time)
-            )
-            db.commit()
+            reader = get_task_reader(extractor_type)  # from your factory.py
+            if reader.is_slow() or reader.supports_webhook():
+                # Mark the job Processing and fetch the document's filename in
+                # the same statement (UPDATE ... FROM documents ... RETURNING)
+                document_filename = db.execute(
+                    _START_JOB,
+                    {
+                        "b_job_uuid": job_uuid,
+                        "b_document_uuid": document_uuid,
+                        "status": ExtractionStatus.PROCESSING,
+                        "start_time": start_time,
+                    },
+                ).scalar_one_or_none()
+                if document_filename is None:
+                    raise RuntimeError(f"Document {document_uuid} or job {job_uuid} not found")
+                # Commit now so the Processing state is visible while extraction runs
+                db.commit()
+            else:
+                # Fast readers go straight to Success; check the job and
+                # document are still live (and fetch the filename the S3
+                # download needs) before spending time extracting
+                document_filename = db.execute(
+                    _DOCUMENT_FILENAME,
+                    {"b_job_uuid": job_uuid, "b_document_uuid": document_uuid},
+                ).scalar_one_or_none()
+                if document_filename is None:
+                    logger.info(
+                        f"Skipping job {job_uuid}: job or document {document_uuid} was deleted"
+                    )
+                    mark_task_complete(document_uuid, job_uuid)
+                    return
             # --- 1. Conditional file retrieval based on storage type ---
             local_file_path = None
             temp_file_path = None
-            # Get document info from database to determine storage type
-            # Use query() method for better session management
-            document = db.query(Document).filter(Document.uuid == document_uuid).first()
-            if not document:
-                raise RuntimeError(f"Document {document_uuid} not found")
             # Check if file is stored in S3 (starts with "projects/") or locally
             if file_path.startswith("projects/"):
                 # Use shared volume coordination for S3 files
                 shared_path = download_to_shared_volume(
-                    document_uuid, file_path, document.filename
+                    document_uuid, file_path, document_filename
                 )
                 local_file_path = shared_path
                 temp_file_path = None  # Don't track as temp (managed by coordinator)
@@ -199,98 +431,76 @@ def process_document_with_extractor(
             else:
                 # File not found in either location
                 raise RuntimeError(f"File not found: {file_path}")
-            # --- 2. Get the right reader ---
-            reader = get_reader(extractor_type)  # from your factory.py
             # --- 3. Start extraction ---
-            result_or_job_id = reader.read(local_file_path)
-            # --- 3. Handle sync vs async ---
-            if reader.supports_webhook():
-                # You would normally not poll here; webhook handler will call back later
-                # For Celery job, you might just exit early and let webhook handler finish DB update
-                page_contents = None
+            _prefetch_file(local_file_path)
+            if reader.supports_page_iteration():
+                # Pages are stored as the reader yields them, never all held at once
+                pages = reader.iter_pages(local_file_path)
             else:
-                if isinstance(result_or_job_id, dict):  # sync reader returned results
-                    page_contents = result_or_job_id
+                result_or_job_id = reader.read(local_file_path)
+                # --- 3. Handle sync vs async ---
+                if reader.supports_webhook():
+                    # You would normally not poll here; webhook handler will call back later
+                    # For Celery job, you might just exit early and let webhook handler finish DB update
+                    page_contents = None
                 else:
-                    job_id = result_or_job_id
-                    # Poll until job finishes
-                    status = reader.get_status(job_id)
-                    while status not in ["succeeded", "failed"]:
-                        logger.info(f"Job {job_id} status: {status}, retrying...")
-                        time.sleep(5)
-                        status = reader.get_status(job_id)
-
-                    if status == "failed":
-                        raise RuntimeError(f"Extraction failed for job {job_id}")
-                    page_contents = reader.get_result(job_id)
+                    if isinstance(result_or_job_id, dict):  # sync reader returned results
+                        page_contents = result_or_job_id
+                    else:
+                        job_id = result_or_job_id
+                        status = _wait_for_job(reader, job_id)
+                        if status == "failed":
+                            raise RuntimeError(f"Extraction failed for job {job_id}")
+                        page_contents = reader.get_result(job_id)
+                pages = (page_contents or {}).items()
 
             # --- 4. Validate and save page contents to DB ---
-            def _has_meaningful_content(pages):
-                try:
-                    if not pages:
-                        return False
-                    for _p, body in pages.items():
-                        data = (body or {}).get("content", {})
-                        text = (
-                            data.get("COMBINED")
-                            or data.get("TEXT")
-                            or data.get("LATEX")
-                            or ""
-                        ).strip()
-                        if text:
-                            return True
-                    return False
-                except Exception:
-                    return False
-
-            if not _has_meaningful_content(page_contents):
+            page_count, has_content, first_content = _store_pages(db, job_uuid, pages)
+            if not has_content:
+                # The rollback in the handler discards any batches already written
                 raise RuntimeError(
                     f"No meaningful content extracted by {extractor_type}"
                 )
-            if page_contents:
-                try:
-                    print(
-                        f"Extractor {extractor_type} produced {len(page_contents)} pages; sample keys: {list(next(iter(page_contents.values())).get('content', {}).keys()) if page_contents else []}"
-                    )
-                except Exception:
-                    pass
-                for page_num, content in page_contents.items():
-                    page_content = DocumentPageContent(
-                        uuid=str(uuid.uuid4()),
-                        extraction_job_uuid=job_uuid,
-                        page_number=page_num,
-                        content=content["content"],
-                    )
-                    db.add(page_content)
+            # lazy=True: the arguments are only evaluated if DEBUG is enabled
+            logger.opt(lazy=True).debug(
+                "Extractor {} produced {} pages; sample keys: {}",
+                lambda: extractor_type,
+                lambda: page_count,
+                lambda: list(first_content) if isinstance(first_content, dict) else [],
+            )
             # --- 5. Latency & cost ---
+            latency_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             end_time = datetime.now(timezone.utc)
-            latency_ms = int((end_time - start_time).total_seconds() * 1000)
-            cost = calculate_extraction_cost(
-                extractor_type, len(page_contents) if page_contents else 0
-            )
+            cost = calculate_extraction_cost(extractor_type, page_count)
             # --- 6. Update job status ---
-            db.execute(
-                update(DocumentExtractionJob)
-                .where(DocumentExtractionJob.uuid == job_uuid)
-                .values(
-                    status=ExtractionStatus.SUCCESS,
-                    end_time=end_time,
-                    latency_ms=latency_ms,
-                    cost=cost,
-                )
-            )
+            finished = db.execute(
+                _FINISH_JOB,
+                {
+                    "b_job_uuid": job_uuid,
+                    "b_start_time": start_time,
+                    "status": ExtractionStatus.SUCCESS,
+                    "end_time": end_time,
+                    "latency_ms": latency_ms,
+                    "cost": cost,
+                },
+            ).scalar_one_or_none()
+            if finished is None:
+                # Deleted while extracting;
+                # the rollback in the handler discards the stored pages
+                raise RuntimeError(f"Extraction job {job_uuid} not found")
             db.commit()
             logger.info(
                 f"Successfully processed document {document_uuid} with {extractor_type}"
             )
-            # Reset circuit breaker on success
-            reset_circuit_breaker(extractor_type)
-            # Mark task complete and cleanup if needed
-            mark_task_complete(document_uuid, job_uuid)
+            # Reset circuit breaker and mark task complete (cleanup if needed)
+            # in one Redis round-trip
+            pipe = redis_client.pipeline()
+            reset_circuit_breaker(extractor_type, pipe=pipe)
+            mark_task_complete(document_uuid, job_uuid, pipe=pipe)
         except Exception as e:
             # Failure path
+            latency_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             end_time = datetime.now(timezone.utc)
-            latency_ms = int((end_time - start_time).total_seconds() * 1000)
             # CRITICAL: Rollback any pending transaction before attempting failure update
             try:
                 db.rollback()
@@ -300,27 +510,32 @@ def process_document_with_extractor(
             # Attempt to update job status to FAILURE
             try:
                 db.execute(
-                    update(DocumentExtractionJob)
-                    .where(DocumentExtractionJob.uuid == job_uuid)
-                    .values(
-                        status=ExtractionStatus.FAILURE,
-                        end_time=end_time,
-                        latency_ms=latency_ms,
-                        cost=0.0,
-                    )
+                    _FINISH_JOB,
+                    {
+                        "b_job_uuid": job_uuid,
+                        "b_start_time": start_time,
+                        "status": ExtractionStatus.FAILURE,
+                        "end_time": end_time,
+                        "latency_ms": latency_ms,
+                        "cost": 0.0,
+                    },
                 )
                 db.commit()
             except Exception as db_err:
                 logger.error(f"Failed to update job status to FAILURE: {db_err}")
                 # Continue with failure handling even if DB update fails
-            # Record failure for circuit breaker
-            record_extractor_failure(extractor_type)
+            # Record failure for circuit breaker; sent together with the
+            # pending-task bookkeeping in mark_task_failed
+            pipe = redis_client.pipeline()
+            record_extractor_failure(extractor_type, pipe)
+            circuit_tripped = mark_task_failed(document_uuid, job_uuid, pipe=pipe)[0]
+            if circuit_tripped:
+                logger.warning(f"Circuit breaker threshold reached for {extractor_type}")
             # Check if infrastructure error - fail immediately
             if is_infrastructure_error(e):
                 logger.error(
                     f"Infrastructure failure for {extractor_type} - NOT RETRYING: {str(e)}"
                 )
-                mark_task_failed(document_uuid, job_uuid)
                 raise  # Don't retry infrastructure errors
             logger.error(
                 f"Failed to process document {document_uuid} with {extractor_type}: {str(e)}"
@@ -330,7 +545,6 @@ def process_document_with_extractor(
                 logger.error(
                     f"Caused by: {type(e.__cause__).__name__}: {str(e.__cause__)}"
                 )
-            mark_task_failed(document_uuid, job_uuid)
             # Get extractor-specific retry config
             retry_config = get_retry_config(extractor_type)
             raise self.retry(
@@ -349,3 +563,17 @@ def process_document_with_extractor(
                     logger.warning(
                         f"Failed to clean up temporary file {temp_file_path}: {e}"
                     )
+
+
+@celery_app.task
+def dispatch_extractors(document_uuid: str, file_path: str, job_extractor_pairs):
+    """
+    Fan out one extraction task per (job_uuid, extractor_type) pair.
+
+    The group publishes every message over a single producer connection, so
+    callers make one .delay() per document instead of one per extractor.
+    """
+    group(
+        process_document_with_extractor.s(job_uuid, document_uuid, file_path, extractor_type)
+        for job_uuid, extractor_type in job_extractor_pairs
+    ).apply_async()
@@ -0,0 +1,99 @@
+"""
+Tests for DocumentExtractionJob.aggregate_feedback.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models.database import DocumentExtractionJob, DocumentPageFeedback, User
+
+
+def _feedback(n, job_uuid, page_number, rating, user_id=1, deleted=False):
+    return DocumentPageFeedback(
+        uuid=f"feedback-{n}",
+        document_uuid="doc-1",
+        page_number=page_number,
+        extraction_job_uuid=job_uuid,
+        rating=rating,
+        user_id=user_id,
+        deleted_at=datetime.now(timezone.utc) if deleted else None,
+    )
+
+
+def _seed_feedback():
+    return [
+        _feedback(1, "job-1", 1, 4),
+        _feedback(2, "job-1", 2, 2),
+        _feedback(3, "job-1", 1, 5, user_id=2),
+        _feedback(4, "job-1", 3, None, user_id=2),
+        _feedback(5, "job-1", 4, 1, deleted=True),
+        _feedback(6, "job-2", 1, 3, user_id=2),
+    ]
+
+
+def _aggregate(job_uuids, user_id=None):
+    """Run aggregate_feedback against a seeded in-memory SQLite database."""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(User.__table__.create)
+                await conn.run_sync(DocumentPageFeedback.__table__.create)
+            async with AsyncSession(engine) as session:
+                session.add_all([
+                    User(id=1, email="one@example.com", hashed_password="x"),
+                    User(id=2, email="two@example.com", hashed_password="x"),
+                ])
+                await session.flush()
+                session.add_all(_seed_feedback())
+                await session.commit()
+                return await DocumentExtractionJob.aggregate_feedback(
+                    session, job_uuids, user_id=user_id
+                )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_aggregate_feedback_empty_input():
+    """Test that no query is needed for an empty list of jobs."""
+    assert asyncio.run(DocumentExtractionJob.aggregate_feedback(None, [])) == {}
+
+
+def test_aggregate_feedback_counts_and_averages():
+    """Test per-job distinct rated pages, average rating and feedback count."""
+    stats = _aggregate(["job-1", "job-2"])
+
+    # job-1: pages 1 and 2 rated (page 1 twice), one unrated row, one deleted
+    assert stats["job-1"] == (2, 11 / 3, 4)
+    assert stats["job-2"] == (1, 3.0, 1)
+
+
+def test_aggregate_feedback_excludes_deleted_rows():
+    """Test that soft-deleted feedback does not count towards the stats."""
+    pages, average, count = _aggregate(["job-1"])["job-1"]
+
+    # The deleted rating of 1 on page 4 is ignored entirely
+    assert pages == 2
+    assert count == 4
+    assert average == 11 / 3
+
+
+def test_aggregate_feedback_filters_by_user():
+    """Test that user_id restricts the stats to that user's feedback."""
+    stats = _aggregate(["job-1", "job-2"], user_id=1)
+
+    assert stats == {"job-1": (2, 3.0, 2)}
+
+
+def test_aggregate_feedback_omits_jobs_without_feedback():
+    """Test that jobs with no live feedback are absent from the result."""
+    stats = _aggregate(["job-2", "job-3"])
+
+    assert set(stats) == {"job-2"}
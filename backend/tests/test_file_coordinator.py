@@ -0,0 +1,106 @@
+"""
+Tests for the Redis bookkeeping in file_coordinator.
+"""
+import os
+import sys
+import pytest
+from unittest.mock import MagicMock, patch
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src import file_coordinator
+
+
+@pytest.fixture
+def redis_mock():
+    """Redis client mock; pipeline().execute() reports 2 tasks still pending."""
+    client = MagicMock()
+    client.pipeline.return_value.execute.return_value = [1, 2]
+    with patch.object(file_coordinator, "redis_client", client):
+        yield client
+
+
+@pytest.fixture
+def cleanup_mock():
+    """Stub out the shared-volume cleanup."""
+    with patch.object(file_coordinator, "cleanup_shared_file") as cleanup:
+        yield cleanup
+
+
+def test_mark_task_complete_keeps_file_while_tasks_pending(redis_mock, cleanup_mock):
+    """Test that the task is removed and its count read in one pipeline round-trip."""
+    file_coordinator.mark_task_complete("doc-1", "job-1")
+
+    pipe = redis_mock.pipeline.return_value
+    pipe.srem.assert_called_once_with("doc_tasks:doc-1", "job-1")
+    pipe.scard.assert_called_once_with("doc_tasks:doc-1")
+    pipe.execute.assert_called_once()
+    cleanup_mock.assert_not_called()
+
+
+def test_mark_task_complete_cleans_up_last_task(redis_mock, cleanup_mock):
+    """Test that the shared file is cleaned up once no tasks remain."""
+    redis_mock.pipeline.return_value.execute.return_value = [1, 0]
+
+    file_coordinator.mark_task_complete("doc-1", "job-1")
+
+    cleanup_mock.assert_called_once_with("doc-1")
+
+
+def test_mark_task_complete_uses_caller_pipeline(redis_mock, cleanup_mock):
+    """Test that a caller-supplied pipeline carries the bookkeeping commands."""
+    pipe = MagicMock()
+    # The caller's own queued command result comes first
+    pipe.execute.return_value = [True, 1, 0]
+
+    results = file_coordinator.mark_task_complete("doc-1", "job-1", pipe)
+
+    assert results == [True, 1, 0]
+    redis_mock.pipeline.assert_not_called()
+    pipe.srem.assert_called_once_with("doc_tasks:doc-1", "job-1")
+    pipe.execute.assert_called_once()
+    cleanup_mock.assert_called_once_with("doc-1")
+
+
+def test_mark_task_failed_cleans_up_when_enabled(redis_mock, cleanup_mock, monkeypatch):
+    """Test that failures clean up the last task's file when CLEANUP_ON_TASK_FAILURE is set."""
+    monkeypatch.setattr(file_coordinator, "CLEANUP_ON_TASK_FAILURE", True)
+    redis_mock.pipeline.return_value.execute.return_value = [1, 0]
+
+    file_coordinator.mark_task_failed("doc-1", "job-1")
+
+    cleanup_mock.assert_called_once_with("doc-1")
+
+
+def test_mark_task_failed_keeps_file_when_disabled(redis_mock, cleanup_mock, monkeypatch):
+    """Test that failures keep the file for retry when CLEANUP_ON_TASK_FAILURE is off."""
+    monkeypatch.setattr(file_coordinator, "CLEANUP_ON_TASK_FAILURE", False)
+    redis_mock.pipeline.return_value.execute.return_value = [1, 0]
+
+    file_coordinator.mark_task_failed("doc-1", "job-1")
+
+    redis_mock.pipeline.return_value.srem.assert_called_once_with("doc_tasks:doc-1", "job-1")
+    cleanup_mock.assert_not_called()
+
+
+def test_mark_task_failed_keeps_file_while_tasks_pending(redis_mock, cleanup_mock, monkeypatch):
+    """Test that failures never clean up while other tasks are pending."""
+    monkeypatch.setattr(file_coordinator, "CLEANUP_ON_TASK_FAILURE", True)
+
+    file_coordinator.mark_task_failed("doc-1", "job-1")
+
+    cleanup_mock.assert_not_called()
+
+
+def test_mark_task_failed_returns_caller_results(redis_mock, cleanup_mock, monkeypatch):
+    """Test that the caller's queued results (e.g. the circuit breaker count) are returned first."""
+    monkeypatch.setattr(file_coordinator, "CLEANUP_ON_TASK_FAILURE", False)
+    pipe = MagicMock()
+    pipe.execute.return_value = [1, 1, 2]
+
+    results = file_coordinator.mark_task_failed("doc-1", "job-1", pipe)
+
+    assert results[0] == 1
+    pipe.execute.assert_called_once()
+    cleanup_mock.assert_not_called()
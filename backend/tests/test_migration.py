@@ -0,0 +1,136 @@
+"""
+Tests for the SQLite migration: the users table rebuild and the user_version gate.
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src import db as dbmod
+from src import migration
+from src.models.database import User
+
+# users table as created before the approval workflow and org columns
+OLD_USERS_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY,
+    email VARCHAR NOT NULL,
+    hashed_password VARCHAR NOT NULL,
+    is_active BOOLEAN,
+    name VARCHAR
+)
+"""
+
+
+def _user_version(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _tables(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    finally:
+        conn.close()
+
+
+def test_rebuild_users_table_preserves_rows_and_fills_defaults():
+    """Test that rebuilding an old users table keeps rows and adds new columns."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(OLD_USERS_SCHEMA)
+    conn.execute(
+        "INSERT INTO users (id, email, hashed_password, is_active, name) "
+        "VALUES (1, 'old@example.com', 'hash', 1, 'Old User')"
+    )
+
+    statements = migration._rebuild_table_statements(
+        User.__table__, {"id", "email", "hashed_password", "is_active", "name"}
+    )
+    for statement in statements:
+        conn.execute(statement)
+
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(users)")]
+    assert columns == [column.name for column in User.__table__.columns]
+    row = conn.execute(
+        "SELECT id, email, hashed_password, is_active, name, is_approved, role, organization_id FROM users"
+    ).fetchone()
+    assert row == (1, "old@example.com", "hash", 1, "Old User", 0, "user", None)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert "_batch_temp_users" not in tables
+    conn.close()
+
+
+def test_rebuild_users_table_creates_indexes():
+    """Test that the model's indexes, including the unique email index, exist afterwards."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(OLD_USERS_SCHEMA)
+
+    for statement in migration._rebuild_table_statements(User.__table__, {"id", "email", "hashed_password"}):
+        conn.execute(statement)
+
+    indexes = {row[1]: row[2] for row in conn.execute("PRAGMA index_list(users)")}
+    for index in User.__table__.indexes:
+        assert index.name in indexes
+    assert indexes["ix_users_email"] == 1
+    conn.close()
+
+
+def test_rebuild_users_table_coalesces_null_not_null_columns():
+    """Test that NULLs in a column that is now NOT NULL take the model default."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(OLD_USERS_SCHEMA.replace("name VARCHAR", "name VARCHAR, role VARCHAR"))
+    conn.execute(
+        "INSERT INTO users (id, email, hashed_password, role) VALUES (1, 'a@example.com', 'hash', NULL)"
+    )
+
+    statements = migration._rebuild_table_statements(
+        User.__table__, {"id", "email", "hashed_password", "is_active", "name", "role"}
+    )
+    for statement in statements:
+        conn.execute(statement)
+
+    assert conn.execute("SELECT role FROM users").fetchone() == ("user",)
+    conn.close()
+
+
+def test_migrate_sqlite_skips_up_to_date_database(tmp_path, monkeypatch):
+    """Test that a database already at SCHEMA_VERSION is left untouched."""
+    db_file = tmp_path / "pdf-extraction.db"
+    conn = sqlite3.connect(db_file)
+    conn.execute(f"PRAGMA user_version = {migration.SCHEMA_VERSION}")
+    conn.close()
+    monkeypatch.setattr(dbmod, "engine_async", None)
+
+    asyncio.run(migration.migrate_sqlite(str(db_file)))
+
+    assert _tables(db_file) == set()
+    assert _user_version(db_file) == migration.SCHEMA_VERSION
+
+
+def test_migrate_sqlite_stamps_fresh_database(tmp_path, monkeypatch):
+    """Test that a fresh database gets the full schema, an admin and the version stamp."""
+    db_file = tmp_path / "pdf-extraction.db"
+    sqlite3.connect(db_file).close()
+    # migrate_sqlite repoints the shared engine at db_file; restore it afterwards
+    monkeypatch.setattr(dbmod, "engine_async", dbmod.engine_async)
+    monkeypatch.setattr(dbmod, "AsyncSessionLocal", dbmod.AsyncSessionLocal)
+
+    asyncio.run(migration.migrate_sqlite(str(db_file)))
+
+    assert _tables(db_file) >= set(dbmod.Base.metadata.tables)
+    assert _user_version(db_file) == migration.SCHEMA_VERSION
+    conn = sqlite3.connect(db_file)
+    try:
+        admin = conn.execute(
+            "SELECT role FROM users WHERE email = ?", (migration.DEFAULT_ADMIN_EMAIL,)
+        ).fetchone()
+        assert admin == ("admin",)
+    finally:
+        conn.close()
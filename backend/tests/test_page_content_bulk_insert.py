@@ -0,0 +1,122 @@
+"""
+Tests for DocumentPageContent.bulk_insert (COPY on Postgres, INSERT otherwise).
+"""
+import csv
+import os
+import sys
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models.database import DocumentPageContent
+
+
+def _rows(count):
+    return [
+        {
+            "uuid": f"page-{n}",
+            "extraction_job_uuid": "job-1",
+            "page_number": n,
+            "content": {"TEXT": f"Page {n} content"},
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def sqlite_session():
+    """Session on an in-memory SQLite database with the page content table."""
+    engine = create_engine("sqlite://")
+    DocumentPageContent.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _postgres_session():
+    """Mocked session whose bind reports the PostgreSQL dialect."""
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    return session
+
+
+def test_bulk_insert_empty_rows_is_noop():
+    """Test that no statement is issued for an empty batch."""
+    session = _postgres_session()
+
+    DocumentPageContent.bulk_insert(session, [])
+
+    session.execute.assert_not_called()
+    session.connection.assert_not_called()
+
+
+def test_bulk_insert_small_batch_inserts_rows(sqlite_session):
+    """Test that a small batch is inserted with metadata_ defaulting to {}."""
+    DocumentPageContent.bulk_insert(sqlite_session, _rows(3))
+    sqlite_session.commit()
+
+    pages = sqlite_session.execute(
+        select(DocumentPageContent).order_by(DocumentPageContent.page_number)
+    ).scalars().all()
+    assert [page.page_number for page in pages] == [1, 2, 3]
+    assert pages[0].content == {"TEXT": "Page 1 content"}
+    assert pages[0].metadata_ == {}
+
+
+def test_bulk_insert_large_batch_on_sqlite_uses_insert(sqlite_session):
+    """Test that COPY is only used on Postgres; SQLite falls back to INSERT."""
+    count = DocumentPageContent.COPY_THRESHOLD + 1
+
+    DocumentPageContent.bulk_insert(sqlite_session, _rows(count))
+    sqlite_session.commit()
+
+    pages = sqlite_session.execute(select(DocumentPageContent)).scalars().all()
+    assert len(pages) == count
+
+
+def test_bulk_insert_small_batch_on_postgres_uses_insert():
+    """Test that batches up to COPY_THRESHOLD use one executemany INSERT."""
+    session = _postgres_session()
+
+    DocumentPageContent.bulk_insert(session, _rows(DocumentPageContent.COPY_THRESHOLD))
+
+    session.execute.assert_called_once()
+    session.connection.assert_not_called()
+
+
+def test_bulk_insert_large_batch_on_postgres_uses_copy():
+    """Test that large batches are streamed through COPY as CSV."""
+    session = _postgres_session()
+    cursor = session.connection.return_value.connection.cursor.return_value
+    count = DocumentPageContent.COPY_THRESHOLD + 1
+
+    DocumentPageContent.bulk_insert(session, _rows(count))
+
+    session.execute.assert_not_called()
+    cursor.copy_expert.assert_called_once()
+    cursor.close.assert_called_once()
+    sql, buf = cursor.copy_expert.call_args.args
+    assert sql == (
+        "COPY document_page_content "
+        "(uuid, extraction_job_uuid, page_number, content, metadata_) "
+        "FROM STDIN WITH (FORMAT CSV)"
+    )
+    records = list(csv.reader(buf))
+    assert len(records) == count
+    assert records[0] == ["page-1", "job-1", "1", '{"TEXT":"Page 1 content"}', "{}"]
+
+
+def test_bulk_insert_copy_closes_cursor_on_error():
+    """Test that the raw cursor is closed when COPY fails."""
+    session = _postgres_session()
+    cursor = session.connection.return_value.connection.cursor.return_value
+    cursor.copy_expert.side_effect = RuntimeError("copy failed")
+
+    with pytest.raises(RuntimeError):
+        DocumentPageContent.bulk_insert(session, _rows(DocumentPageContent.COPY_THRESHOLD + 1))
+
+    cursor.close.assert_called_once()
@@ -0,0 +1,55 @@
+"""
+Tests for route_extraction_task queue selection.
+"""
+import os
+import sys
+import pytest
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# src.tasks imports every extractor through the factory
+tasks = pytest.importorskip("src.tasks")
+
+from src.constants import CPU_BOUND_EXTRACTORS, CPU_EXTRACTION_QUEUE
+
+TASK_NAME = "src.tasks.process_document_with_extractor"
+
+
+@pytest.mark.parametrize("extractor_type", sorted(CPU_BOUND_EXTRACTORS))
+def test_cpu_bound_extractor_routed_to_cpu_queue(extractor_type):
+    """Test that CPU-bound extractors passed positionally go to the prefork queue."""
+    args = ("job-1", "doc-1", "/shared/doc-1_file.pdf", extractor_type)
+
+    route = tasks.route_extraction_task(TASK_NAME, args, {}, {})
+
+    assert route == {"queue": CPU_EXTRACTION_QUEUE}
+
+
+def test_cpu_bound_extractor_in_kwargs_routed_to_cpu_queue():
+    """Test that extractor_type is also read from keyword arguments."""
+    kwargs = {
+        "job_uuid": "job-1",
+        "document_uuid": "doc-1",
+        "file_path": "/shared/doc-1_file.pdf",
+        "extractor_type": "PyMuPDF",
+    }
+
+    route = tasks.route_extraction_task(TASK_NAME, (), kwargs, {})
+
+    assert route == {"queue": CPU_EXTRACTION_QUEUE}
+
+
+@pytest.mark.parametrize("extractor_type", ["LlamaParse", "Mathpix", "Textract"])
+def test_api_extractor_keeps_default_queue(extractor_type):
+    """Test that API-backed extractors are not routed (default gevent queue)."""
+    args = ("job-1", "doc-1", "/shared/doc-1_file.pdf", extractor_type)
+
+    assert tasks.route_extraction_task(TASK_NAME, args, {}, {}) is None
+
+
+def test_task_without_extractor_keeps_default_queue():
+    """Test that tasks without an extractor argument, like dispatch_extractors, are not routed."""
+    args = ("doc-1", "/shared/doc-1_file.pdf", [("job-1", "PyMuPDF")])
+
+    assert tasks.route_extraction_task("src.tasks.dispatch_extractors", args, {}, {}) is None